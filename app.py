@@ -4,14 +4,41 @@
 # NOTE: Only wording, seeds, and template context changed. Schema, routes, and logic preserved.
 
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+
+# Under gunicorn's gevent workers (GEVENT=1, see gunicorn.conf.py) patch the stdlib first so
+# smtplib and database sockets yield to other requests instead of blocking the whole worker
+if os.environ.get('GEVENT') == '1':
+    from gevent import monkey
+
+    monkey.patch_all()
+
+import io
+import re
+import atexit
+import csv
+import time
+import functools
+import hmac
+import queue
+import threading
+from email import message_from_string
+from email.message import EmailMessage
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, make_response, \
+    Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from flask_caching import Cache
+import fastjsonschema
+import orjson
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import joinedload, raiseload, undefer, undefer_group
+from sqlalchemy.sql.functions import FunctionElement
+from werkzeug.datastructures import ImmutableDict
+from datetime import datetime, date, timedelta
 import logging
 
+from notifications.smtp_client import MAIL_POLICY, SMTPPool, is_transient_error
+
 # Load environment variables from .env file
 from dotenv import load_dotenv
 
@@ -30,8 +57,19 @@ except ImportError as e:
     EMAIL_SERVICE_AVAILABLE = False
     logger.warning(f"Email service not available: {e}")
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson: request.get_json() and jsonify() parse/serialize in orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 ## App configuration
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
 
 # Database configuration for Render (PostgreSQL) vs local (SQLite)
@@ -42,12 +80,32 @@ if database_url:
     if database_url.startswith('postgres://'):
         database_url = database_url.replace('postgres://', 'postgresql+psycopg://', 1)
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    if database_url.startswith(('postgresql', 'mysql')):
+        # Warm, health-checked pool per worker: pre_ping replaces dead sockets with a cheap SELECT 1
+        # instead of raising OperationalError, recycle retires connections before server idle timeouts.
+        # Size it so WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) fits the server's max_connections.
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': 30,
+            'pool_pre_ping': True,
+            'pool_recycle': 1800
+        }
 else:
     # Development - SQLite
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///smartmove_transport.db'
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Cache configuration: Redis when REDIS_URL is set (shared across workers), in-process otherwise
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    app.config['CACHE_TYPE'] = 'RedisCache'
+    app.config['CACHE_REDIS_URL'] = redis_url
+else:
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+
 
 # Company-wide constants for templates and notifications
 COMPANY_NAME = "SmartMove Transport"
@@ -57,22 +115,144 @@ COMPANY_PHONE_RAW = "4165056927"
 COMPANY_EMAIL = "smartmove.ca@outlook.com"
 SERVICE_AREAS = "GTA, Ottawa & Surrounding Areas"
 
-# Initialize database
+# Compiled once; fullmatch anchors the whole string, same rule as the client-side check in booking.js
+EMAIL_RE = re.compile(r'[^\s@]+@[^\s@]+\.[^\s@]+')
+
+# JSON payload validators, compiled once into straight-line Python by fastjsonschema
+BOOKING_REQUIRED_FIELDS = ('name', 'email', 'phone', 'service_id', 'description', 'date', 'time', 'address')
+CONTACT_REQUIRED_FIELDS = ('name', 'email', 'subject', 'message')
+_NON_EMPTY_STRING = {'type': 'string', 'minLength': 1}
+
+validate_booking_payload = fastjsonschema.compile({
+    'type': 'object',
+    'required': list(BOOKING_REQUIRED_FIELDS),
+    'properties': {
+        'name': _NON_EMPTY_STRING,
+        'email': _NON_EMPTY_STRING,
+        'phone': _NON_EMPTY_STRING,
+        'service_id': {'type': ['integer', 'string'], 'minimum': 1, 'pattern': '^[0-9]+$'},
+        'description': _NON_EMPTY_STRING,
+        'date': _NON_EMPTY_STRING,
+        'time': _NON_EMPTY_STRING,
+        'address': _NON_EMPTY_STRING
+    }
+})
+
+validate_contact_payload = fastjsonschema.compile({
+    'type': 'object',
+    'required': list(CONTACT_REQUIRED_FIELDS),
+    'properties': {field: _NON_EMPTY_STRING for field in CONTACT_REQUIRED_FIELDS}
+})
+
+
+def payload_error(validator, data, required_fields):
+    """Run a compiled validator and return the API error message, or None if the payload is valid."""
+    try:
+        validator(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        if not isinstance(data, dict):
+            return 'Invalid request body'
+        if e.rule == 'required':
+            field = next(f for f in required_fields if f not in data)
+        else:
+            field = e.path[-1]
+        if e.rule in ('required', 'minLength') or e.value is None:
+            return f'Missing required field: {field}'
+        return f'Invalid value for field: {field}'
+    return None
+
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+@functools.lru_cache(maxsize=None)
+def constant_json(key, message, status):
+    """
+    (body, status, headers) for an API response whose body never changes, encoded once.
+    Only pass fixed strings: every distinct message stays cached for the life of the process.
+    """
+    return orjson.dumps({key: message}), status, _JSON_HEADERS
+
+
+# Booking status changes that notify the customer
+STATUS_CHANGE_EVENTS = {
+    'confirmed': 'booking_confirmed',
+    'cancelled': 'booking_cancelled',
+    'completed': 'booking_completed',
+}
+
+BULK_BOOKINGS_MAX = 500
+
+ADMIN_BOOKINGS_PER_PAGE = 50
+ADMIN_EXPORT_BATCH_SIZE = 200
+
+# Browsers/CDNs may reuse the informational pages for this long before revalidating
+PUBLIC_PAGE_MAX_AGE = 300
+
+# SMTP settings for the fallback emails, read once at import instead of on every send
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SENDER_EMAIL = os.environ.get('MAIL_USERNAME') or COMPANY_EMAIL
+SENDER_PASSWORD = os.environ.get('MAIL_PASSWORD')
+
+# Process-wide SMTP pool: connections (and their TLS + AUTH handshake) are reused across
+# requests and mail batches instead of being opened per email
+smtp_pool = SMTPPool(SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD,
+                     maxsize=int(os.getenv('SMTP_POOL_SIZE', 5)), keepalive_interval=30)
+atexit.register(smtp_pool.close)
+
+# Initialize database and cache
 db = SQLAlchemy(app)
+cache = Cache(app)
 
-# Initialize email service if available
+# Initialize email service if available; it sends over the same pool as the fallback emails
 email_service = None
 if EMAIL_SERVICE_AVAILABLE:
     try:
-        email_service = EmailService()
+        email_service = EmailService(smtp_pool)
         logger.info("Email service initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize email service: {e}")
         email_service = None
 
 
+class utcnow(FunctionElement):
+    """
+    The database clock's current UTC time as a naive DATETIME, matching the datetime.utcnow() values
+    older rows hold. Plain now() would follow the Postgres session timezone and, on SQLite, drop
+    the sub-second part.
+    """
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'mysql')
+def _utcnow_mysql(element, compiler, **kw):
+    # Parenthesized so it is also valid as a column DEFAULT expression
+    return '(UTC_TIMESTAMP(6))'
+
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is UTC on SQLite but only to the second
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
 # Database Models (unchanged)
 class Service(db.Model):
+    # (is_active, id) serves the active-services listings, including index()'s first-3 lookup
+    __table_args__ = (db.Index('ix_service_active_id', 'is_active', 'id'),)
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -80,23 +260,37 @@ class Service(db.Model):
     duration = db.Column(db.String(50), nullable=False)
     icon = db.Column(db.String(50), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow())
+    # Never lazy-load a service's bookings; query them explicitly when needed
+    bookings = db.relationship('Booking', back_populates='service', lazy='raise')
 
 
 class Booking(db.Model):
+    # (status, created_at) serves status counts and newest-first listings of one status;
+    # it also covers plain status lookups, so status itself needs no separate index
+    __table_args__ = (db.Index('ix_booking_status_created', 'status', 'created_at'),)
+
     id = db.Column(db.Integer, primary_key=True)
     customer_name = db.Column(db.String(100), nullable=False)
     customer_email = db.Column(db.String(100), nullable=False)
     customer_phone = db.Column(db.String(20), nullable=False)
     service_id = db.Column(db.Integer, db.ForeignKey('service.id'), nullable=False)
-    service = db.relationship('Service', backref=db.backref('bookings', lazy=True))
-    project_description = db.Column(db.Text, nullable=False)  # used for move details / notes
+    # Every booking view renders the service, so fetch it in the same query
+    service = db.relationship('Service', back_populates='bookings', lazy='joined')
+    # Free-text columns are deferred: list queries skip them, notification emails undefer the group
+    project_description = db.deferred(db.Column(db.Text, nullable=False), group='details')  # move details / notes
     preferred_date = db.Column(db.String(50), nullable=False)
     preferred_time = db.Column(db.String(50), nullable=False)
-    address = db.Column(db.Text, nullable=False)  # pickup address
+    address = db.deferred(db.Column(db.Text, nullable=False), group='details')  # pickup address
     status = db.Column(db.String(20), default='pending')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps come from the database clock: utcnow() is inlined into the INSERT/UPDATE rather than a
+    # Python datetime bound per row. server_default covers rows written outside the ORM; default is kept
+    # because tables created before this have no column default.
+    created_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), index=True)
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(),
+                           onupdate=utcnow())
+    # First 61 characters of the description for list views (enough to know whether to add "...")
+    description_preview = db.column_property(db.func.substr(project_description, 1, 61), deferred=True)
 
 
 class Testimonial(db.Model):
@@ -105,8 +299,8 @@ class Testimonial(db.Model):
     project_type = db.Column(db.String(100), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
     comment = db.Column(db.Text, nullable=False)
-    is_featured = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_featured = db.Column(db.Boolean, default=False, index=True)
+    created_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow())
 
 
 class ContactMessage(db.Model):
@@ -115,67 +309,156 @@ class ContactMessage(db.Model):
     email = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20))
     subject = db.Column(db.String(200), nullable=False)
-    message = db.Column(db.Text, nullable=False)
+    message = db.deferred(db.Column(db.Text, nullable=False))
     status = db.Column(db.String(20), default='new')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow())
+
+
+# (expires_at, 'YYYY-MM-DD') for the booking form's minimum date.
+# Replaced as a single tuple so concurrent requests never see half an update.
+_today_cache = (0.0, '')
+
+
+def today_str():
+    """Local date string, reformatted only after local midnight passes."""
+    global _today_cache
+    expires_at, value = _today_cache
+    if time.time() >= expires_at:
+        today = date.today()
+        next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        value = today.strftime('%Y-%m-%d')
+        _today_cache = (next_midnight.timestamp(), value)
+    return value
+
+
+# Template context is constant, so build it once and hand the same read-only mapping to every render
+_COMPANY_CONTEXT = ImmutableDict(
+    COMPANY_NAME=COMPANY_NAME,
+    SLOGAN=SLOGAN,
+    COMPANY_PHONE=COMPANY_PHONE,
+    COMPANY_EMAIL=COMPANY_EMAIL,
+    SERVICE_AREAS=SERVICE_AREAS
+)
+# Footer year, rebuilt only when today_str()'s midnight-expiring date moves into a new year.
+# Not an import-time constant: with preload_app every worker is forked from the same master import.
+_year_context = ImmutableDict(current_year=0)
 
 
 # Template context processors: provide company info and year globally
 @app.context_processor
 def inject_company_info():
-    return {
-        'COMPANY_NAME': COMPANY_NAME,
-        'SLOGAN': SLOGAN,
-        'COMPANY_PHONE': COMPANY_PHONE,
-        'COMPANY_EMAIL': COMPANY_EMAIL,
-        'SERVICE_AREAS': SERVICE_AREAS,
-        'current_year': datetime.now().year
-    }
+    return _COMPANY_CONTEXT
+
+
+@app.context_processor
+def inject_current_year():
+    global _year_context
+    year = int(today_str()[:4])
+    if _year_context['current_year'] != year:
+        _year_context = ImmutableDict(current_year=year)
+    return _year_context
+
+
+# Cached reference data: services and testimonials change rarely, so skip the SELECTs on page views
+@cache.memoize()
+def get_featured_services():
+    return Service.query.filter_by(is_active=True).limit(3).all()
+
+
+@cache.memoize()
+def get_active_services():
+    return Service.query.filter_by(is_active=True).all()
+
+
+@cache.memoize()
+def get_featured_testimonials():
+    return Testimonial.query.filter_by(is_featured=True).all()
+
+
+# Rendered HTML of the pages built only from the reference data above, so a cache hit skips
+# both the queries and the template render. booking.html embeds today's date, hence the argument.
+@cache.memoize()
+def render_index_page():
+    return render_template('index.html', services=get_featured_services(),
+                           testimonials=get_featured_testimonials())
+
 
+@cache.memoize()
+def render_services_page():
+    return render_template('services.html', services=get_active_services())
 
-# Initialize database tables and seed moving services/testimonials (non-destructive)
-with app.app_context():
+
+@cache.memoize()
+def render_about_page():
+    return render_template('about.html', testimonials=get_featured_testimonials())
+
+
+@cache.memoize()
+def render_booking_page(today):
+    return render_template('booking.html', services=get_active_services(), today=today)
+
+
+def invalidate_reference_cache():
+    """Call after any change to services or testimonials."""
+    cache.delete_memoized(get_featured_services)
+    cache.delete_memoized(get_active_services)
+    cache.delete_memoized(get_featured_testimonials)
+    cache.delete_memoized(render_index_page)
+    cache.delete_memoized(render_services_page)
+    cache.delete_memoized(render_about_page)
+    cache.delete_memoized(render_booking_page)
+
+
+# Initialize database tables and seed moving services/testimonials (non-destructive).
+# Runs from the `flask seed-initial` CLI command at deploy time rather than on every import / worker boot.
+def seed_database():
+    """Create tables and indexes, then seed services/testimonials if empty. Needs an app context."""
     db.create_all()
 
-    # Seed initial moving service data if none exists
-    if Service.query.count() == 0:
+    # create_all() skips tables that already exist, so add any indexes missing from older databases
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    # Seed initial moving service data if none exists (LIMIT 1 probe, not a full COUNT(*))
+    if db.session.query(Service.id).first() is None:
         services = [
-            Service(
+            dict(
                 name="Residential Moving",
                 description="Full-service residential moves: apartments, condos, and houses. Includes careful handling of furniture, appliances, and specialty items.",
                 price_range="$150 - $1,500+",
                 duration="Same day - 2 days (depends on home size & distance)",
                 icon="📦"
             ),
-            Service(
+            dict(
                 name="Office & Commercial Moving",
                 description="Professional office relocation services: desks, IT equipment, modular offices, and efficient commercial logistics.",
                 price_range="$500 - $10,000+",
                 duration="1-5 days",
                 icon="🏢"
             ),
-            Service(
+            dict(
                 name="Packing & Unpacking",
                 description="Professional packing and unpacking services using quality materials to keep items safe during transit.",
                 price_range="$100 - $1,200+",
                 duration="2-8 hours (per job)",
                 icon="🧰"
             ),
-            Service(
+            dict(
                 name="Truck & Driver Rental",
                 description="Rent a truck with a professional driver. Ideal for DIY moves where you need a vehicle and experienced operator.",
                 price_range="$80/hr - $200/hr",
                 duration="Hourly / Daily",
                 icon="🚚"
             ),
-            Service(
+            dict(
                 name="Long Distance Moving",
                 description="Intercity and long-distance moves with trusted partners and secure transport. Door-to-door service available.",
                 price_range="$1,200 - $10,000+",
                 duration="1-7 days (depending on distance)",
                 icon="🛣️"
             ),
-            Service(
+            dict(
                 name="Junk Removal & Disposal",
                 description="Removal of unwanted items, clean-outs, and responsible disposal/recycling of materials after your move.",
                 price_range="$75 - $1,000+",
@@ -183,27 +466,28 @@ with app.app_context():
                 icon="🗑️"
             )
         ]
-        db.session.bulk_save_objects(services)
+        # Plain mappings skip ORM object construction and go out as one executemany
+        db.session.execute(db.insert(Service), services)
         logger.info("Initial moving services seeded")
 
     # Seed a few testimonials relevant to moving
-    if Testimonial.query.count() == 0:
+    if db.session.query(Testimonial.id).first() is None:
         testimonials = [
-            Testimonial(
+            dict(
                 customer_name="Aisha & Daniel Park",
                 project_type="Residential Move",
                 rating=5,
                 comment="SmartMove Transport made our move effortless — punctual crew, careful with our furniture, and great communication.",
                 is_featured=True
             ),
-            Testimonial(
+            dict(
                 customer_name="MapleTech Offices",
                 project_type="Office Relocation",
                 rating=5,
                 comment="Seamless office move with minimal downtime. Professional team and excellent coordination.",
                 is_featured=True
             ),
-            Testimonial(
+            dict(
                 customer_name="Paul N.",
                 project_type="Long Distance Move",
                 rating=5,
@@ -211,153 +495,259 @@ with app.app_context():
                 is_featured=True
             )
         ]
-        db.session.bulk_save_objects(testimonials)
+        db.session.execute(db.insert(Testimonial), testimonials)
         logger.info("Initial moving testimonials seeded")
 
+    # Single commit covers both seed blocks
     db.session.commit()
+    invalidate_reference_cache()
+
+
+@app.cli.command("seed-initial")
+def seed_command():
+    """Create database tables and seed initial data: `flask --app app seed-initial` (run once per deploy)"""
+    seed_database()
+    logger.info("Database ready")
+
+
+def _send_html(to, subject, html, smtp=None):
+    """Send a single HTML email over the given session, or a pooled one if none is passed."""
+    message = EmailMessage(policy=MAIL_POLICY)
+    message.set_content(html, subtype="html")
+    message["Subject"] = subject
+    message["From"] = SENDER_EMAIL
+    message["To"] = to
+
+    if smtp is not None:
+        smtp.send_message(message)
+        return
+    with smtp_pool.acquire() as pooled:
+        pooled.send_message(message)
 
 
 # Notification helpers (preserve original behavior, updated wording where applicable)
-def send_booking_notifications(booking, service, event_type):
+def send_booking_notifications(booking, service, event_type, smtp=None):
     """
     Send customer and admin notifications for booking events.
     event_type one of: 'booking_created', 'booking_confirmed', 'booking_cancelled', 'booking_completed'
     """
-    # Send customer email if email service is available
+    # Customer email plus admin notification (for created/cancelled events) in one SMTP batch
     if email_service:
         try:
-            email_service.send_booking_email(booking, service, event_type)
+            email_service.dispatch(booking, service, event_type, smtp)
         except Exception as e:
             logger.error(f"EmailService failed to send {event_type}: {e}")
     else:
         # fallback: send basic HTML email using SMTP (if credentials available)
         if event_type == 'booking_created':
-            send_fallback_email_notification(booking, service)
-
-    # Send admin notifications for created/cancelled events
-    if event_type in ['booking_created', 'booking_cancelled']:
-        if email_service:
-            try:
-                email_service.send_admin_notification(booking, service, event_type)
-            except Exception as e:
-                logger.error(f"EmailService failed to send admin notification: {e}")
+            send_fallback_email_notification(booking, service, smtp)
 
 
-def send_fallback_email_notification(booking, service):
+def send_fallback_email_notification(booking, service, smtp=None):
     """Fallback simple email if templated email service not available."""
+    if not SENDER_PASSWORD:
+        logger.warning("Email credentials not configured. Fallback email skipped.")
+        return
     try:
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        port = int(os.getenv("SMTP_PORT", 587))
-        sender_email = os.environ.get('MAIL_USERNAME') or COMPANY_EMAIL
-        password = os.environ.get('MAIL_PASSWORD')
-
-        if not sender_email or not password:
-            logger.warning("Email credentials not configured. Fallback email skipped.")
-            return
-
-        message = MIMEMultipart("alternative")
-        message["Subject"] = f"{COMPANY_NAME} - Move Request Received"
-        message["From"] = sender_email
-        message["To"] = booking.customer_email
-
-        html = f"""
-        <html>
-          <body>
-            <h2>Thank you for choosing {COMPANY_NAME}!</h2>
-            <p><strong>Move Details:</strong></p>
-            <ul>
-              <li><strong>Name:</strong> {booking.customer_name}</li>
-              <li><strong>Service:</strong> {service.name}</li>
-              <li><strong>Preferred Date:</strong> {booking.preferred_date}</li>
-              <li><strong>Preferred Time:</strong> {booking.preferred_time}</li>
-              <li><strong>Notes:</strong> {booking.project_description}</li>
-              <li><strong>Pickup Address:</strong> {booking.address}</li>
-            </ul>
-            <p>We will contact you within 24 hours to confirm details and provide a quote.</p>
-            <p>For urgent moves, call us at <strong>{COMPANY_PHONE}</strong>.</p>
-            <br>
-            <p>Best regards,<br>{COMPANY_NAME} Team</p>
-          </body>
-        </html>
-        """
-        message.attach(MIMEText(html, "html"))
-
-        with smtplib.SMTP(smtp_server, port) as server:
-            server.starttls()
-            server.login(sender_email, password)
-            server.send_message(message)
-
+        html = render_template('emails/booking_confirmation.html', booking=booking, service=service)
+        _send_html(booking.customer_email, f"{COMPANY_NAME} - Move Request Received", html, smtp)
         logger.info(f"Fallback confirmation email sent to {booking.customer_email}")
     except Exception as e:
         logger.error(f"Failed to send fallback email: {str(e)}")
 
 
-def send_contact_confirmation_email(contact_message):
+def send_contact_confirmation_email(contact_message, smtp=None):
     """Send confirmation email to user when they submit contact form."""
+    if not SENDER_PASSWORD:
+        logger.warning("Email credentials not configured. Contact confirmation email skipped.")
+        return
     try:
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        port = int(os.getenv("SMTP_PORT", 587))
-        sender_email = os.environ.get('MAIL_USERNAME') or COMPANY_EMAIL
-        password = os.environ.get('MAIL_PASSWORD')
+        html = render_template('emails/contact_confirmation.html', message=contact_message)
+        _send_html(contact_message.email, f"{COMPANY_NAME} - We Received Your Message", html, smtp)
+        logger.info(f"Contact confirmation email sent to {contact_message.email}")
+    except Exception as e:
+        logger.error(f"Failed to send contact confirmation email: {str(e)}")
+
+
+def send_contact_admin_fallback_email(contact_message, smtp=None):
+    """Fallback admin notification for contact form messages when EmailService is unavailable."""
+    if not SENDER_PASSWORD:
+        return
+    try:
+        html = render_template('emails/admin_contact.html', message=contact_message)
+        _send_html(COMPANY_EMAIL, f"New Contact Message - {contact_message.subject}", html, smtp)
+    except Exception as e:
+        logger.error(f"Failed to send fallback admin notification: {e}")
+
+
+def send_contact_notifications(contact_message, smtp=None):
+    """Send the user confirmation and the admin notification for a contact form message."""
+    send_contact_confirmation_email(contact_message, smtp)
+
+    if email_service:
+        try:
+            email_service.send_contact_message(contact_message, smtp)
+        except Exception as e:
+            logger.error(f"Failed to send contact notification: {e}")
+    else:
+        send_contact_admin_fallback_email(contact_message, smtp)
+
+
+# Background mail queue: routes enqueue (kind, payload) and return immediately,
+# a daemon worker drains batches and sends each batch over one SMTP session.
+MAIL_BATCH_SIZE = 100
+MAIL_BATCH_WAIT = 1  # seconds after the first item to wait for more mail before sending a batch
+
+mail_queue = queue.Queue()
+_mail_worker = None
+_mail_worker_lock = threading.Lock()
+
+
+def _process_booking_notifications(booking_id, event_type, smtp=None):
+    booking = db.session.get(Booking, booking_id, options=[undefer_group('details')])
+    if booking:
+        send_booking_notifications(booking, booking.service, event_type, smtp)
+
 
-        if not sender_email or not password:
-            logger.warning("Email credentials not configured. Contact confirmation email skipped.")
+def _process_booking_email(booking_id, event_type, smtp=None):
+    booking = db.session.get(Booking, booking_id, options=[undefer_group('details')])
+    if booking and email_service:
+        email_service.send_booking_email(booking, booking.service, event_type, smtp)
+
+
+def _process_contact_notifications(contact_id, smtp=None):
+    contact_message = db.session.get(ContactMessage, contact_id, options=[undefer(ContactMessage.message)])
+    if contact_message:
+        send_contact_notifications(contact_message, smtp)
+
+
+MAIL_HANDLERS = {
+    'booking_notifications': _process_booking_notifications,
+    'booking_email': _process_booking_email,
+    'contact_notifications': _process_contact_notifications,
+}
+
+
+class MailOutbox:
+    """Stands in for an SMTPSession in MAIL_HANDLERS: keeps the messages instead of sending them."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message, stream=False):
+        self.messages.append(message)
+        return {}
+
+
+# With CELERY_BROKER_URL set, mail goes to Celery workers (`celery -A app.celery_app worker`)
+# instead of the in-process thread, so queued mail survives web restarts and scales separately
+celery_app = None
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+if CELERY_BROKER_URL:
+    try:
+        from celery import Celery
+        from kombu.exceptions import OperationalError as BrokerError
+    except ImportError as e:
+        logger.warning(f"Celery not available, using the in-process mail worker: {e}")
+    else:
+        celery_app = Celery('smartmove', broker=CELERY_BROKER_URL)
+
+        @celery_app.task
+        def send_mail_task(kind, **payload):
+            # Render every message the handler would send, then hand each one to its own delivery
+            # task: a retry re-sends only the message that failed, never the ones already delivered
+            outbox = MailOutbox()
+            with app.app_context():
+                MAIL_HANDLERS[kind](smtp=outbox, **payload)
+            for message in outbox.messages:
+                deliver_mail_task.delay(message.as_string())
+
+        @celery_app.task(bind=True, max_retries=5, default_retry_delay=60)
+        def deliver_mail_task(self, raw_message):
+            message = message_from_string(raw_message, policy=MAIL_POLICY)
+            try:
+                with smtp_pool.acquire() as smtp:
+                    smtp.send_message(message)
+            except Exception as e:
+                # Disconnects and 4xx replies may clear up; 5xx (bad address, auth, rejected content) will not
+                if is_transient_error(e):
+                    raise self.retry(exc=e)
+                logger.error(f"Dropping email to {message['To']} after a permanent SMTP failure: {e}")
+
+
+def enqueue_mail(kind, **payload):
+    """Queue a notification for the background worker. Payloads carry ids, never ORM objects."""
+    if celery_app is not None:
+        try:
+            send_mail_task.delay(kind, **payload)
             return
+        except (BrokerError, OSError) as e:
+            # The row is already committed: a broker outage must not turn into a 500 (and a resubmitted
+            # duplicate), so send this one from the in-process worker instead
+            logger.error(f"Could not queue {kind} on Celery, sending in-process: {e}")
+    _ensure_mail_worker()
+    mail_queue.put((kind, payload))
+
+
+def _ensure_mail_worker():
+    # Started lazily so each Gunicorn worker process gets its own thread after fork
+    global _mail_worker
+    if _mail_worker is not None and _mail_worker.is_alive():
+        return
+    with _mail_worker_lock:
+        if _mail_worker is None or not _mail_worker.is_alive():
+            _mail_worker = threading.Thread(target=_mail_worker_loop, name='mail-worker', daemon=True)
+            _mail_worker.start()
+
+
+def _next_mail_batch():
+    batch = [mail_queue.get()]
+    # One deadline for the whole batch, so a steady trickle of mail cannot hold the first item back
+    deadline = time.monotonic() + MAIL_BATCH_WAIT
+    while len(batch) < MAIL_BATCH_SIZE:
+        try:
+            batch.append(mail_queue.get(timeout=max(0, deadline - time.monotonic())))
+        except queue.Empty:
+            break
+    return batch
 
-        message = MIMEMultipart("alternative")
-        message["Subject"] = f"{COMPANY_NAME} - We Received Your Message"
-        message["From"] = sender_email
-        message["To"] = contact_message.email
-
-        html = f"""
-        <html>
-          <body>
-            <h2>Thank you for contacting {COMPANY_NAME}!</h2>
-            <p>We have received your message and will get back to you within 24 hours.</p>
-
-            <p><strong>Your Message Details:</strong></p>
-            <ul>
-              <li><strong>Name:</strong> {contact_message.name}</li>
-              <li><strong>Subject:</strong> {contact_message.subject}</li>
-              <li><strong>Message:</strong> {contact_message.message}</li>
-            </ul>
-
-            <p>For urgent matters, please call us directly at <strong>{COMPANY_PHONE}</strong>.</p>
-            <br>
-            <p>Best regards,<br>{COMPANY_NAME} Team</p>
-          </body>
-        </html>
-        """
-        message.attach(MIMEText(html, "html"))
-
-        with smtplib.SMTP(smtp_server, port) as server:
-            server.starttls()
-            server.login(sender_email, password)
-            server.send_message(message)
 
-        logger.info(f"Contact confirmation email sent to {contact_message.email}")
-    except Exception as e:
-        logger.error(f"Failed to send contact confirmation email: {str(e)}")
+def _mail_worker_loop():
+    while True:
+        batch = _next_mail_batch()
+        with app.app_context(), smtp_pool.acquire() as smtp:
+            for kind, payload in batch:
+                try:
+                    MAIL_HANDLERS[kind](smtp=smtp, **payload)
+                except Exception as e:
+                    logger.error(f"Mail worker failed to process {kind}: {e}")
+                finally:
+                    mail_queue.task_done()
+
+
+def public_page(html):
+    """Response for a rarely-changing page: publicly cacheable, with an ETag so revalidation can 304."""
+    response = make_response(html)
+    response.cache_control.public = True
+    response.cache_control.max_age = PUBLIC_PAGE_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 # Routes (same endpoints, reworded for views)
 @app.route('/')
 def index():
-    services = Service.query.filter_by(is_active=True).limit(3).all()
-    testimonials = Testimonial.query.filter_by(is_featured=True).all()
-    return render_template('index.html', services=services, testimonials=testimonials)
+    return public_page(render_index_page())
 
 
 @app.route('/services')
 def services():
-    services = Service.query.filter_by(is_active=True).all()
-    return render_template('services.html', services=services)
+    return public_page(render_services_page())
 
 
 @app.route('/about')
 def about():
-    testimonials = Testimonial.query.filter_by(is_featured=True).all()
-    return render_template('about.html', testimonials=testimonials)
+    return public_page(render_about_page())
 
 
 @app.route('/contact', methods=['GET', 'POST'])
@@ -381,49 +771,8 @@ def contact():
         db.session.add(contact_message)
         db.session.commit()
 
-        # Send confirmation email to user
-        send_contact_confirmation_email(contact_message)
-
-        # Notify admin by email
-        if email_service:
-            try:
-                email_service.send_contact_message(contact_message)
-            except Exception as e:
-                logger.error(f"Failed to send contact notification: {e}")
-        else:
-            # Fallback admin notification
-            try:
-                smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-                port = int(os.getenv("SMTP_PORT", 587))
-                sender_email = os.environ.get('MAIL_USERNAME') or COMPANY_EMAIL
-                password = os.environ.get('MAIL_PASSWORD')
-
-                if sender_email and password:
-                    admin_message = MIMEMultipart("alternative")
-                    admin_message["Subject"] = f"New Contact Message - {contact_message.subject}"
-                    admin_message["From"] = sender_email
-                    admin_message["To"] = COMPANY_EMAIL
-
-                    html = f"""
-                    <html>
-                      <body>
-                        <h2>New Contact Form Message</h2>
-                        <p><strong>From:</strong> {contact_message.name}</p>
-                        <p><strong>Email:</strong> {contact_message.email}</p>
-                        <p><strong>Phone:</strong> {contact_message.phone or 'Not provided'}</p>
-                        <p><strong>Subject:</strong> {contact_message.subject}</p>
-                        <p><strong>Message:</strong> {contact_message.message}</p>
-                      </body>
-                    </html>
-                    """
-                    admin_message.attach(MIMEText(html, "html"))
-
-                    with smtplib.SMTP(smtp_server, port) as server:
-                        server.starttls()
-                        server.login(sender_email, password)
-                        server.send_message(admin_message)
-            except Exception as e:
-                logger.error(f"Failed to send fallback admin notification: {e}")
+        # Confirm to the user and notify admin in the background
+        enqueue_mail('contact_notifications', contact_id=contact_message.id)
 
         flash('Thank you for your message! We will get back to you within 24 hours.', 'success')
         return redirect(url_for('contact'))
@@ -433,8 +782,7 @@ def contact():
 
 @app.route('/booking')
 def booking_page():
-    services = Service.query.filter_by(is_active=True).all()
-    return render_template('booking.html', services=services, today=datetime.now().strftime('%Y-%m-%d'))
+    return render_booking_page(today_str())
 
 
 @app.route('/api/bookings', methods=['POST'])
@@ -443,17 +791,22 @@ def create_booking():
         data = request.get_json()
 
         # Validate required fields (same fields kept)
-        required_fields = ['name', 'email', 'phone', 'service_id', 'description', 'date', 'time', 'address']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        error = payload_error(validate_booking_payload, data, BOOKING_REQUIRED_FIELDS)
+        if error:
+            return constant_json('error', error, 400)
+
+        # Look the service up inside the same transaction as the INSERT; an unknown id is a client
+        # error rather than a foreign-key failure at commit time
+        service = db.session.get(Service, int(data['service_id']))
+        if service is None or not service.is_active:
+            return constant_json('error', 'Please select a valid service', 400)
 
         # Create booking (address = pickup address)
         booking = Booking(
             customer_name=data['name'],
             customer_email=data['email'],
             customer_phone=data['phone'],
-            service_id=data['service_id'],
+            service=service,
             project_description=data['description'],
             preferred_date=data['date'],
             preferred_time=data['time'],
@@ -463,24 +816,76 @@ def create_booking():
         db.session.add(booking)
         db.session.commit()
 
-        # Get service details for notifications
-        service = db.session.get(Service, data['service_id'])
-
-        # Send notifications (email service preferred, fallback available)
-        if email_service:
-            send_booking_notifications(booking, service, "booking_created")
-        else:
-            send_fallback_email_notification(booking, service)
+        # Send notifications in the background (email service preferred, fallback available)
+        enqueue_mail('booking_notifications', booking_id=booking.id, event_type='booking_created')
 
         return jsonify({
             'message': 'Move request submitted successfully! We will contact you within 24 hours.',
             'booking_id': booking.id
-        }), 201
+        }), 202
 
     except Exception as e:
         logger.error(f"Booking error: {str(e)}")
         db.session.rollback()
-        return jsonify({'error': 'Failed to process move request'}), 500
+        return constant_json('error', 'Failed to process move request', 500)
+
+
+@app.route('/api/bookings/bulk', methods=['POST'])
+def create_bookings_bulk():
+    """Create many bookings from a JSON array in one multi-row INSERT and one commit (no notifications)."""
+    try:
+        data = request.get_json()
+        if not isinstance(data, list) or not data:
+            return constant_json('error', 'Expected a non-empty list of bookings', 400)
+        if len(data) > BULK_BOOKINGS_MAX:
+            return constant_json('error', f'At most {BULK_BOOKINGS_MAX} bookings per request', 400)
+
+        for position, item in enumerate(data):
+            error = payload_error(validate_booking_payload, item, BOOKING_REQUIRED_FIELDS)
+            if error:
+                return jsonify({'error': f'Booking {position}: {error}'}), 400
+
+        # One SELECT for every referenced service instead of one lookup per booking
+        service_ids = {int(item['service_id']) for item in data}
+        active_ids = set(db.session.scalars(
+            db.select(Service.id).where(Service.id.in_(service_ids), Service.is_active)
+        ))
+        for position, item in enumerate(data):
+            if int(item['service_id']) not in active_ids:
+                return jsonify({'error': f'Booking {position}: Please select a valid service'}), 400
+
+        rows = [
+            dict(
+                customer_name=item['name'],
+                customer_email=item['email'],
+                customer_phone=item['phone'],
+                service_id=int(item['service_id']),
+                project_description=item['description'],
+                preferred_date=item['date'],
+                preferred_time=item['time'],
+                address=item['address']
+            )
+            for item in data
+        ]
+        # executemany with RETURNING: SQLAlchemy batches this into multi-row INSERT ... VALUES
+        booking_ids = list(db.session.scalars(
+            db.insert(Booking).returning(Booking.id, sort_by_parameter_order=True), rows
+        ))
+        db.session.commit()
+
+        # No customer/admin emails for imports: this endpoint is unauthenticated, and one request
+        # could otherwise send a thousand emails to caller-chosen addresses. Imported bookings show
+        # up in the admin dashboard, and status changes there notify the customer as usual.
+
+        return jsonify({
+            'message': f'{len(booking_ids)} move requests submitted successfully.',
+            'booking_ids': booking_ids
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Bulk booking error: {str(e)}")
+        db.session.rollback()
+        return constant_json('error', 'Failed to process move requests', 500)
 
 
 @app.route('/api/contact', methods=['POST'])
@@ -489,16 +894,13 @@ def submit_contact():
         data = request.get_json()
 
         # Validate required fields
-        required_fields = ['name', 'email', 'subject', 'message']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        error = payload_error(validate_contact_payload, data, CONTACT_REQUIRED_FIELDS)
+        if error:
+            return constant_json('error', error, 400)
 
         # Validate email format
-        import re
-        email_pattern = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
-        if not re.match(email_pattern, data['email']):
-            return jsonify({'error': 'Please enter a valid email address'}), 400
+        if not EMAIL_RE.fullmatch(data['email']):
+            return constant_json('error', 'Please enter a valid email address', 400)
 
         # Create contact message
         contact_message = ContactMessage(
@@ -512,70 +914,159 @@ def submit_contact():
         db.session.add(contact_message)
         db.session.commit()
 
-        # Send confirmation email to user
-        send_contact_confirmation_email(contact_message)
-
-        # Notify admin by email
-        if email_service:
-            try:
-                email_service.send_contact_message(contact_message)
-            except Exception as e:
-                logger.error(f"Failed to send contact notification: {e}")
+        # Confirm to the user and notify admin in the background
+        enqueue_mail('contact_notifications', contact_id=contact_message.id)
 
         logger.info(f"Contact form submitted by {contact_message.name} ({contact_message.email})")
 
-        return jsonify({
-            'message': 'Thank you for your message! We will get back to you within 24 hours.'
-        }), 201
+        return constant_json('message', 'Thank you for your message! We will get back to you within 24 hours.', 202)
 
     except Exception as e:
         logger.error(f"Contact form error: {str(e)}")
         db.session.rollback()
-        return jsonify({'error': 'Failed to submit message. Please try again.'}), 500
+        return constant_json('error', 'Failed to submit message. Please try again.', 500)
+
+
+# Bookings from one bulk INSERT can share a created_at; id makes the order total so OFFSET
+# pages never repeat or skip a row
+BOOKINGS_NEWEST_FIRST = (Booking.created_at.desc(), Booking.id.desc())
 
 
 @app.route('/admin/bookings')
 def admin_bookings():
-    bookings = Booking.query.order_by(Booking.created_at.desc()).all()
-    return render_template('admin.html', bookings=bookings)
+    options = [joinedload(Booking.service), undefer(Booking.description_preview)]
+    if app.debug:
+        # Fail loudly in development if the template touches any relationship not loaded here
+        options.append(raiseload('*'))
+    # created_at is indexed, so the ORDER BY walks the index and only one page of rows is materialized
+    pagination = Booking.query.options(*options).order_by(*BOOKINGS_NEWEST_FIRST).paginate(
+        page=request.args.get('page', 1, type=int),
+        per_page=ADMIN_BOOKINGS_PER_PAGE
+    )
+    # Dashboard stats cover every booking, not just the current page
+    status_counts = dict(
+        db.session.query(Booking.status, db.func.count(Booking.id)).group_by(Booking.status).all()
+    )
+    response = make_response(render_template('admin.html', bookings=pagination.items, pagination=pagination,
+                                             status_counts=status_counts))
+    # Live operational data: never let a browser or proxy keep a copy
+    response.cache_control.no_store = True
+    return response
+
+
+BOOKING_EXPORT_COLUMNS = (
+    ('ID', Booking.id),
+    ('Created', Booking.created_at),
+    ('Status', Booking.status),
+    ('Customer', Booking.customer_name),
+    ('Email', Booking.customer_email),
+    ('Phone', Booking.customer_phone),
+    ('Service', Service.name),
+    ('Preferred Date', Booking.preferred_date),
+    ('Preferred Time', Booking.preferred_time),
+    ('Pickup Address', Booking.address),
+    ('Move Details', Booking.project_description),
+)
+
+
+# Cells a spreadsheet would evaluate as a formula when the export is opened
+_CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Phone numbers like "+1 416-505-6927": only digits and punctuation, so nothing a formula could call
+_PHONE_LIKE_RE = re.compile(r'[+\d][\d\s().+-]*')
+
+
+def csv_safe_row(row):
+    """Neutralize customer-supplied text that Excel/Sheets would run as a formula (CSV injection)."""
+    return [f"'{value}" if (isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES)
+                            and not _PHONE_LIKE_RE.fullmatch(value)) else value
+            for value in row]
+
+
+# The export holds every customer's contact details, so unlike the rest of /admin it needs a password
+# (HTTP Basic, any username); with ADMIN_EXPORT_PASSWORD unset the export is switched off
+ADMIN_EXPORT_PASSWORD = os.environ.get('ADMIN_EXPORT_PASSWORD')
+
+
+def export_authorized():
+    auth = request.authorization
+    return bool(auth and auth.password
+                and hmac.compare_digest(auth.password.encode(), ADMIN_EXPORT_PASSWORD.encode()))
+
+
+@app.route('/admin/bookings/export.csv')
+def export_bookings():
+    """Stream every booking (optionally ?status=...) as CSV without loading the table into memory."""
+    if not ADMIN_EXPORT_PASSWORD:
+        return constant_json('error', 'Export is disabled', 404)
+    if not export_authorized():
+        response = make_response(*constant_json('error', 'Authentication required', 401))
+        response.headers['WWW-Authenticate'] = 'Basic realm="SmartMove admin export"'
+        return response
+
+    query = (
+        db.select(*(column for _, column in BOOKING_EXPORT_COLUMNS))
+        .join(Booking.service)
+        .order_by(*BOOKINGS_NEWEST_FIRST)
+        # Server-side cursor on PostgreSQL: rows arrive in batches instead of all at once
+        .execution_options(stream_results=True, yield_per=ADMIN_EXPORT_BATCH_SIZE)
+    )
+    status = request.args.get('status')
+    if status:
+        query = query.where(Booking.status == status)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(name for name, _ in BOOKING_EXPORT_COLUMNS)
+        for partition in db.session.execute(query).partitions():
+            writer.writerows(map(csv_safe_row, partition))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    response = Response(stream_with_context(generate()), mimetype='text/csv')
+    filename = f"bookings-{status}.csv" if status else "bookings.csv"
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.cache_control.no_store = True
+    return response
 
 
 @app.route('/api/admin/bookings/<int:booking_id>/status', methods=['PUT'])
 def update_booking_status(booking_id):
     try:
         data = request.get_json()
-        booking = db.session.get(Booking, booking_id)
-        if not booking:
-            return jsonify({'error': 'Booking not found'}), 404
-
-        new_status = data.get('status', booking.status)
-
-        # Determine event type based on status change
-        event_type = None
-        if new_status == 'confirmed' and booking.status != 'confirmed':
-            event_type = 'booking_confirmed'
-        elif new_status == 'cancelled' and booking.status != 'cancelled':
-            event_type = 'booking_cancelled'
-        elif new_status == 'completed' and booking.status != 'completed':
-            event_type = 'booking_completed'
-
-        booking.status = new_status
-        db.session.commit()
+        new_status = data.get('status')
+
+        # One conditional UPDATE instead of SELECT + UPDATE: a row only matches if the status
+        # actually changes, so two admins clicking at once cannot both trigger the notification
+        changed = False
+        if new_status is not None:
+            result = db.session.execute(
+                db.update(Booking)
+                .where(Booking.id == booking_id, Booking.status.is_distinct_from(new_status))
+                .values(status=new_status),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+            changed = result.rowcount > 0
 
-        # Send appropriate notifications if status changed
+        # Nothing updated: either the status was already set (a no-op) or there is no such booking
+        if not changed and db.session.query(Booking.id).filter_by(id=booking_id).first() is None:
+            return constant_json('error', 'Booking not found', 404)
+
+        # Send appropriate notifications in the background if status changed
+        event_type = STATUS_CHANGE_EVENTS.get(new_status) if changed else None
         if event_type:
-            service = db.session.get(Service, booking.service_id)
-            if email_service:
-                try:
-                    email_service.send_booking_email(booking, service, event_type)
-                except Exception as e:
-                    logger.error(f"Failed sending status email: {e}")
+            enqueue_mail('booking_email', booking_id=booking_id, event_type=event_type)
 
-        return jsonify({'message': 'Status updated successfully'})
+        return constant_json('message', 'Status updated successfully', 200)
 
     except Exception as e:
         logger.error(f"Status update error: {str(e)}")
-        return jsonify({'error': 'Failed to update status'}), 500
+        db.session.rollback()
+        return constant_json('error', 'Failed to update status', 500)
 
 
 # ----------------------------
@@ -623,4 +1114,10 @@ if __name__ == '__main__':
     logger.info(f"Contact: {COMPANY_PHONE} | {COMPANY_EMAIL}")
     logger.info(f"Production: {not debug}")
 
+    # The dev server has no separate deploy step, so prepare the database here unless
+    # AUTO_CREATE_ALL=0 (e.g. when a release step already ran `flask seed-initial`)
+    if os.environ.get('AUTO_CREATE_ALL', '1') == '1':
+        with app.app_context():
+            seed_database()
+
     app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
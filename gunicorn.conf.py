@@ -0,0 +1,21 @@
+# gunicorn.conf.py — SmartMove Transport production server settings
+# Picked up automatically by `gunicorn app:app` from the project root.
+# The app is I/O bound (SMTP, database, template rendering), so gevent workers
+# let each process keep many requests in flight instead of one per worker.
+import multiprocessing
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gevent"
+worker_connections = 1000
+keepalive = 5
+
+# Import the app once in the master and fork workers from it (shared read-only pages)
+preload_app = True
+
+# Recycle workers periodically to contain slow memory leaks; jitter avoids restarting all at once
+max_requests = 10000
+max_requests_jitter = 1000
+
+# Tells app.py to monkey-patch the stdlib for gevent before anything else is imported
+raw_env = ["GEVENT=1"]
@@ -1,18 +1,142 @@
 # notifications/email_service.py
 import os
-import smtplib
 import random
 import logging
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader
+from email.message import EmailMessage
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 from datetime import datetime
 
+from .events import BOOKING_EVENT_TYPES, EVENT_TYPES, EventType, to_event_type
+from .smtp_client import MAIL_POLICY, SMTPPool, SMTPSession
+
 logger = logging.getLogger(__name__)
 
+# Display titles per EventType ("booking_created" -> "Booking Created"), built once
+EVENT_TITLES = {event: name.replace('_', ' ').title() for name, event in EVENT_TYPES.items()}
+# Events the admin also gets an email for
+ADMIN_EVENT_TYPES = frozenset((EventType.CREATED, EventType.CANCELLED))
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '../templates/emails')
+
+# One Environment per process, shared by every EmailService: templates only change on deploy,
+# so skip the per-render mtime stat, never evict compiled templates, and reuse compiled
+# bytecode across worker restarts
+_ENV = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False, cache_size=-1,
+                   bytecode_cache=FileSystemBytecodeCache())
+
+# SmartMove Transport email variations
+_GREETINGS = (
+    "Hi {name},",
+    "Hello {name},",
+    "Dear {name},",
+    "Good day {name},"
+)
+
+# Intro lines, indexed by EventType
+_INTROS = (
+    # BOOKING RECEIVED
+    (
+        "Thanks for choosing SmartMove Transport!",
+        "Your moving request has been received!",
+        "We're excited to help you with your upcoming move.",
+        "Thanks for trusting SmartMove Transport with your move!"
+    ),
+
+    # CONFIRMED
+    (
+        "Great news — your move is officially confirmed.",
+        "Your moving date and time are now booked.",
+        "Your SmartMove Transport booking is confirmed.",
+        "Everything is set for your upcoming move!"
+    ),
+
+    # CANCELLED
+    (
+        "Your moving request has been cancelled.",
+        "We've processed your cancellation as requested.",
+        "Your SmartMove Transport booking has been cancelled.",
+        "Your cancellation has been confirmed."
+    ),
+
+    # COMPLETED
+    (
+        "Your move has been successfully completed!",
+        "We're happy to let you know your move is now finished!",
+        "Your SmartMove Transport moving service is complete.",
+        "Thank you for moving with SmartMove Transport!"
+    ),
+)
+
+_CLOSINGS = (
+    "Best regards,",
+    "Thank you,",
+    "Warm regards,",
+    "Sincerely,",
+    "With appreciation,"
+)
+
+# Subject lines, indexed by EventType; {s} is the service name, filled in with one str.format per send
+_SUBJECTS = (
+    (
+        "SmartMove Transport – {s} Request Received",
+        "Your Moving Request: {s}",
+        "Move Request Confirmed – {s}",
+        "Thanks for Choosing SmartMove Transport!"
+    ),
+    (
+        "Your Move is Confirmed – {s}",
+        "Moving Date Scheduled – {s}",
+        "SmartMove Transport Confirmation – {s}",
+        "Everything is Set for Your Move!"
+    ),
+    (
+        "Move Cancelled – {s}",
+        "Cancellation Confirmation – {s}",
+        "SmartMove Transport: Booking Cancelled",
+        "Your Move Has Been Cancelled"
+    ),
+    (
+        "Your Move is Complete – {s}",
+        "Moving Service Completed – {s}",
+        "SmartMove Transport – Move Completed",
+        "Your SmartMove Service Is Finished!"
+    )
+)
+_DEFAULT_SUBJECTS = ("SmartMove Transport – Update",)
+
+ADMIN_SUBJECT = "ADMIN: Move {event_title} – {service_name}"
+
+# Compiled once at import; rendering is a call into the generated template function
+_ADMIN_TEMPLATE = _ENV.from_string("""
+        <html>
+            <body>
+                <h3>Move {{ event_title }}</h3>
+
+                <p><strong>Customer:</strong> {{ booking.customer_name }}</p>
+                <p><strong>Email:</strong> {{ booking.customer_email }}</p>
+                <p><strong>Phone:</strong> {{ booking.customer_phone }}</p>
+
+                <p><strong>Service:</strong> {{ service.name }}</p>
+                <p><strong>Preferred Move Time:</strong> {{ booking.preferred_date }} at {{ booking.preferred_time }}</p>
+                <p><strong>Move Details:</strong> {{ booking.project_description }}</p>
+                <p><strong>Pickup Address:</strong> {{ booking.address }}</p>
+
+                <p><strong>Status:</strong> {{ booking.status }}</p>
+            </body>
+        </html>
+        """)
+
+
+def _require_event_type(event_type):
+    """EventType for a public method's event_type argument (wire name or EventType)"""
+    event = to_event_type(event_type)
+    if event is None:
+        raise ValueError(f"Unknown booking event: {event_type!r}")
+    return event
+
 
 class EmailService:
-    def __init__(self):
+    def __init__(self, smtp_pool=None):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
         self.smtp_port = int(os.getenv("SMTP_PORT", 587))
         self.sender_email = os.getenv("MAIL_USERNAME")
@@ -21,103 +145,84 @@ class EmailService:
         # UPDATED BRAND NAME
         self.sender_name = os.getenv("MAIL_SENDER_NAME", "SmartMove Transport")
         self.admin_email = os.getenv("ADMIN_EMAIL", "can2naija@gmail.com")
+        # Extra addresses (e.g. dispatch) blind-copied on every customer booking email, both the
+        # dispatch() confirmations and send_booking_email status changes: comma-separated
+        self.bcc_recipients = tuple(addr.strip() for addr in os.getenv("MAIL_BCC", "").split(",") if addr.strip())
 
         # Template environment
-        template_dir = os.path.join(os.path.dirname(__file__), '../templates/emails')
-        self.env = Environment(loader=FileSystemLoader(template_dir))
-
-        self._setup_variations()
-
-    def _setup_variations(self):
-        """SmartMove Transport email variations"""
-        self.variations = {
-            'greetings': [
-                "Hi {name},",
-                "Hello {name},",
-                "Dear {name},",
-                "Good day {name},"
-            ],
-
-            # BOOKING RECEIVED
-            'booking_created_intro': [
-                "Thanks for choosing SmartMove Transport!",
-                "Your moving request has been received!",
-                "We're excited to help you with your upcoming move.",
-                "Thanks for trusting SmartMove Transport with your move!"
-            ],
-
-            # CONFIRMED
-            'booking_confirmed_intro': [
-                "Great news — your move is officially confirmed.",
-                "Your moving date and time are now booked.",
-                "Your SmartMove Transport booking is confirmed.",
-                "Everything is set for your upcoming move!"
-            ],
-
-            # CANCELLED
-            'booking_cancelled_intro': [
-                "Your moving request has been cancelled.",
-                "We've processed your cancellation as requested.",
-                "Your SmartMove Transport booking has been cancelled.",
-                "Your cancellation has been confirmed."
-            ],
-
-            # COMPLETED
-            'booking_completed_intro': [
-                "Your move has been successfully completed!",
-                "We're happy to let you know your move is now finished!",
-                "Your SmartMove Transport moving service is complete.",
-                "Thank you for moving with SmartMove Transport!"
-            ],
-
-            'closings': [
-                "Best regards,",
-                "Thank you,",
-                "Warm regards,",
-                "Sincerely,",
-                "With appreciation,"
-            ]
-        }
+        self.env = _ENV
+        # Indexed by EventType, like the variation tables
+        self._templates = tuple(_ENV.get_template(f"{name}.html") for name in BOOKING_EVENT_TYPES)
+
+        # Shared, kept-alive SMTP connections instead of connect + STARTTLS + login per email. The app
+        # passes in its process-wide pool; a pool of our own is only built for standalone use.
+        if smtp_pool is None:
+            smtp_pool = SMTPPool(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password,
+                                 maxsize=int(os.getenv('SMTP_POOL_SIZE', 5)), keepalive_interval=30)
+        self._pool = smtp_pool
+
+    def _send(self, message, smtp=None):
+        """Send over the caller's session (e.g. a mail worker batch) or a pooled one"""
+        if smtp is not None:
+            smtp.send_message(message)
+            return
+        with self._pool.acquire() as session:
+            session.send_message(message)
 
     def _get_subject_variation(self, event_type, service_name):
         """SmartMove Transport subject lines"""
-        subjects = {
-            'booking_created': [
-                f"SmartMove Transport – {service_name} Request Received",
-                f"Your Moving Request: {service_name}",
-                f"Move Request Confirmed – {service_name}",
-                f"Thanks for Choosing SmartMove Transport!"
-            ],
-            'booking_confirmed': [
-                f"Your Move is Confirmed – {service_name}",
-                f"Moving Date Scheduled – {service_name}",
-                f"SmartMove Transport Confirmation – {service_name}",
-                f"Everything is Set for Your Move!"
-            ],
-            'booking_cancelled': [
-                f"Move Cancelled – {service_name}",
-                f"Cancellation Confirmation – {service_name}",
-                f"SmartMove Transport: Booking Cancelled",
-                f"Your Move Has Been Cancelled"
-            ],
-            'booking_completed': [
-                f"Your Move is Complete – {service_name}",
-                f"Moving Service Completed – {service_name}",
-                f"SmartMove Transport – Move Completed",
-                f"Your SmartMove Service Is Finished!"
-            ]
+        event = to_event_type(event_type)
+        subjects = _SUBJECTS[event] if event is not None else _DEFAULT_SUBJECTS
+        return subjects[random.randrange(len(subjects))].format(s=service_name)
+
+    @staticmethod
+    def _get_random_variation(variations):
+        """Pick random text variation from one of the module-level tuples"""
+        return variations[random.randrange(len(variations))]
+
+    def build_booking_mime(self, booking, service, event_type):
+        """Render the customer-facing email for a booking event without sending it"""
+        event = _require_event_type(event_type)
+        template = self._templates[event]
+        first_name = (booking.customer_name or '').partition(' ')[0] or booking.customer_name
+
+        context = {
+            'booking': booking,
+            'service': service,
+            'greeting': self._get_random_variation(_GREETINGS).format(name=first_name),
+            'intro_message': self._get_random_variation(_INTROS[event]),
+            'closing': self._get_random_variation(_CLOSINGS),
+            'sender_name': self.sender_name,
+            'sender_email': self.sender_email,
+            'current_year': datetime.now().year,
+            'customer_first_name': first_name,
         }
-        return random.choice(subjects.get(event_type, [f"SmartMove Transport – Update"]))
 
-    def _get_random_variation(self, variation_type, **kwargs):
-        """Pick random text variation"""
-        variations = self.variations.get(variation_type, [])
-        if variations:
-            chosen = random.choice(variations)
-            return chosen.format(**kwargs) if kwargs else chosen
-        return ""
+        html_body = template.render(**context)
+
+        message = EmailMessage(policy=MAIL_POLICY)
+
+        message.set_content(html_body, subtype="html")
+        message["Subject"] = self._get_subject_variation(event, service.name)
+        message["From"] = f"{self.sender_name} <{self.sender_email}>"
+        message["To"] = booking.customer_email
+        return message
+
+    def build_admin_mime(self, booking, service, event_type, admin_email):
+        """Render the admin notification for a booking event without sending it"""
+        event_title = EVENT_TITLES[_require_event_type(event_type)]
+
+        html_content = _ADMIN_TEMPLATE.render(booking=booking, service=service, event_title=event_title)
+
+        message = EmailMessage(policy=MAIL_POLICY)
+
+        message.set_content(html_content, subtype="html")
+        message["Subject"] = ADMIN_SUBJECT.format(event_title=event_title, service_name=service.name)
+        message["From"] = self.sender_email
+        message["To"] = admin_email
+        return message
 
-    def send_booking_email(self, booking, service, event_type):
+    def send_booking_email(self, booking, service, event_type, smtp=None):
         """
         Sends customer-facing email notifications.
         Structure unchanged — only the content was updated.
@@ -127,91 +232,107 @@ class EmailService:
             return False
 
         try:
-            template_name = f"{event_type}.html"
-            template = self.env.get_template(template_name)
-
-            context = {
-                'booking': booking,
-                'service': service,
-                'greeting': self._get_random_variation('greetings', name=booking.customer_name.split()[0]),
-                'intro_message': self._get_random_variation(f'{event_type}_intro'),
-                'closing': self._get_random_variation('closings'),
-                'sender_name': self.sender_name,
-                'sender_email': self.sender_email,
-                'current_year': datetime.now().year,
-                'customer_first_name': booking.customer_name.split()[
-                    0] if booking.customer_name else booking.customer_name,
-            }
-
-            html_body = template.render(**context)
-
-            message = MIMEMultipart("alternative")
-            message["Subject"] = self._get_subject_variation(event_type, service.name)
-            message["From"] = f"{self.sender_name} <{self.sender_email}>"
-            message["To"] = booking.customer_email
-
-            message.attach(MIMEText(html_body, "html"))
+            event = _require_event_type(event_type)
+            message = self.build_booking_mime(booking, service, event)
+            if self.bcc_recipients:
+                message["Bcc"] = ", ".join(self.bcc_recipients)
+            self._send(message, smtp)
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
-
-            logger.info(f"SmartMove {event_type} email sent to {booking.customer_email}")
+            logger.info("SmartMove %s email sent to %s", BOOKING_EVENT_TYPES[event], booking.customer_email)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send SmartMove email: {str(e)}")
+            logger.error("Failed to send SmartMove email: %s", e)
             return False
 
-    def send_admin_notification(self, booking, service, event_type):
+    def send_admin_notification(self, booking, service, event_type, smtp=None):
         """Admin-facing notification (kept same, reworded to moving context)"""
         admin_email = os.getenv("ADMIN_EMAIL")
         if not admin_email:
             return False
 
         try:
-            subject = f"ADMIN: Move {event_type.replace('_', ' ').title()} – {service.name}"
-
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.sender_email
-            message["To"] = admin_email
+            event = _require_event_type(event_type)
+            self._send(self.build_admin_mime(booking, service, event, admin_email), smtp)
 
-            html_content = f"""
-            <html>
-                <body>
-                    <h3>Move {event_type.replace('_', ' ').title()}</h3>
-
-                    <p><strong>Customer:</strong> {booking.customer_name}</p>
-                    <p><strong>Email:</strong> {booking.customer_email}</p>
-                    <p><strong>Phone:</strong> {booking.customer_phone}</p>
-
-                    <p><strong>Service:</strong> {service.name}</p>
-                    <p><strong>Preferred Move Time:</strong> {booking.preferred_date} at {booking.preferred_time}</p>
-                    <p><strong>Move Details:</strong> {booking.project_description}</p>
-                    <p><strong>Pickup Address:</strong> {booking.address}</p>
+            logger.info("Admin SmartMove notification sent for %s", BOOKING_EVENT_TYPES[event])
+            return True
 
-                    <p><strong>Status:</strong> {booking.status}</p>
-                </body>
-            </html>
-            """
+        except Exception as e:
+            logger.error("Failed admin notification: %s", e)
+            return False
 
-            message.attach(MIMEText(html_content, "html"))
+    def send_booking_notifications(self, booking, service, event_type, notify_admin=False, smtp=None,
+                                   bcc_recipients=()):
+        """
+        Build the customer email (and the admin notification if requested) up front and
+        send them back-to-back over one SMTP session via send_batch. bcc_recipients are
+        Bcc'd on the customer email, so every copy goes out in the same DATA transfer.
+        """
+        if not self.sender_email or not self.sender_password:
+            logger.warning("Email credentials not configured. Email skipped.")
+            return 0
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+        event = _require_event_type(event_type)
+        messages = []
+        try:
+            message = self.build_booking_mime(booking, service, event)
+            if bcc_recipients:
+                # send_message() adds Bcc addresses as extra RCPT TOs on the same transaction and strips
+                # the header, so internal dispatch addresses never show on the customer's copy
+                message["Bcc"] = ", ".join(bcc_recipients)
+            messages.append(message)
+        except Exception as e:
+            logger.error("Failed to build SmartMove email: %s", e)
 
-            logger.info(f"Admin SmartMove notification sent for {event_type}")
-            return True
+        admin_email = os.getenv("ADMIN_EMAIL")
+        if notify_admin and admin_email:
+            try:
+                messages.append(self.build_admin_mime(booking, service, event, admin_email))
+            except Exception as e:
+                logger.error("Failed to build admin notification: %s", e)
 
-        except Exception as e:
-            logger.error(f"Failed admin notification: {str(e)}")
-            return False
+        return self.send_batch(messages, smtp)
 
-    def send_contact_message(self, contact_message):
+    def dispatch(self, booking, service, event_type, smtp=None):
+        """
+        Single entry point for a booking event: render the customer email (Bcc MAIL_BCC) and,
+        for ADMIN_EVENT_TYPES, the admin copy once each, then send both over one SMTP connection
+        """
+        event = _require_event_type(event_type)
+        return self.send_booking_notifications(booking, service, event,
+                                               notify_admin=event in ADMIN_EVENT_TYPES, smtp=smtp,
+                                               bcc_recipients=self.bcc_recipients)
+
+    def send_many(self, events):
+        """Send (booking, service, event_type) events for a batch job over one pooled connection"""
+        with self._pool.acquire() as session:
+            return sum(self.dispatch(booking, service, event_type, session)
+                       for booking, service, event_type in events)
+
+    def close(self):
+        """Quit the pooled SMTP connections (e.g. at process exit)"""
+        self._pool.close()
+
+    def send_batch(self, messages, smtp=None):
+        """Send several prepared messages over one SMTP session; returns how many went out"""
+        if not messages:
+            return 0
+        if smtp is None:
+            with self._pool.acquire() as session:
+                return self.send_batch(messages, session)
+
+        sent = 0
+        for message in messages:
+            try:
+                smtp.send_message(message)
+                sent += 1
+                logger.info("Email '%s' sent to %s", message['Subject'], message['To'])
+            except Exception as e:
+                logger.error("Failed to send email to %s: %s", message['To'], e)
+        return sent
+
+    def send_contact_message(self, contact_message, smtp=None):
         """Send contact form notification to admin"""
         if not self.sender_email or not self.sender_password:
             logger.warning("Email credentials not configured. Contact email skipped.")
@@ -227,7 +348,7 @@ class EmailService:
                     COMPANY_NAME=self.sender_name
                 )
             except Exception as template_error:
-                logger.warning(f"Contact template not found, using fallback: {template_error}")
+                logger.warning("Contact template not found, using fallback: %s", template_error)
                 # Fallback HTML
                 html_body = f"""
                 <html>
@@ -242,33 +363,29 @@ class EmailService:
                 </html>
                 """
 
-            message = MIMEMultipart("alternative")
+            message = EmailMessage(policy=MAIL_POLICY)
+
+            message.set_content(html_body, subtype="html")
             message["Subject"] = f"New Contact Message - {contact_message.subject}"
             message["From"] = f"{self.sender_name} <{self.sender_email}>"
             message["To"] = self.admin_email
 
-            message.attach(MIMEText(html_body, "html"))
-
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+            self._send(message, smtp)
 
-            logger.info(f"Contact notification sent to admin from {contact_message.email}")
+            logger.info("Contact notification sent to admin from %s", contact_message.email)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send contact email: {str(e)}")
+            logger.error("Failed to send contact email: %s", e)
             return False
 
     def test_connection(self):
         """Test SMTP connection and credentials"""
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
+            with SMTPSession(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password) as session:
+                session.connection()
                 logger.info("SMTP connection test successful")
                 return True
         except Exception as e:
-            logger.error(f"SMTP connection test failed: {str(e)}")
+            logger.error("SMTP connection test failed: %s", e)
             return False
\ No newline at end of file
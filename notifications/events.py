@@ -0,0 +1,24 @@
+# notifications/events.py
+from enum import IntEnum
+
+
+class EventType(IntEnum):
+    """Booking lifecycle events; the values index the per-event message tables"""
+    CREATED = 0
+    CONFIRMED = 1
+    CANCELLED = 2
+    COMPLETED = 3
+
+
+# Wire names used by the app and the email template files, in EventType order
+BOOKING_EVENT_TYPES = ('booking_created', 'booking_confirmed', 'booking_cancelled', 'booking_completed')
+
+# str -> EventType, applied once at the public API boundary
+EVENT_TYPES = {name: EventType(index) for index, name in enumerate(BOOKING_EVENT_TYPES)}
+
+
+def to_event_type(event_type):
+    """EventType for a wire name (an EventType passes straight through); None if unknown"""
+    if isinstance(event_type, EventType):
+        return event_type
+    return EVENT_TYPES.get(event_type)
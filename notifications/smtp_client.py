@@ -0,0 +1,323 @@
+# notifications/smtp_client.py
+import copy
+import time
+import queue
+import smtplib
+import logging
+import threading
+from contextlib import contextmanager
+from email.generator import BytesGenerator
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import getaddresses
+
+logger = logging.getLogger(__name__)
+
+# For EmailMessage(policy=MAIL_POLICY): non-ASCII bodies get quoted-printable/base64 rather than
+# raw 8bit, since send_message() does not negotiate 8BITMIME with the server
+MAIL_POLICY = SMTP_POLICY.clone(cte_type='7bit')
+
+
+class _DataWriter:
+    """
+    File-like sink for BytesGenerator that applies SMTP DATA framing as the message is
+    generated (CRLF line endings, dot-stuffing, terminating '.') and writes it to the
+    socket in bufsize chunks, so the flattened message never exists in memory as a whole.
+    """
+
+    def __init__(self, sock, bufsize=8192):
+        self._sock = sock
+        self._bufsize = bufsize
+        self._partial = b''
+        self._out = bytearray()
+
+    def write(self, data):
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._add_line(line)
+        if len(self._out) >= self._bufsize:
+            self._flush()
+
+    def _add_line(self, line):
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        if line.startswith(b'.'):
+            self._out += b'.'
+        self._out += line
+        self._out += b'\r\n'
+
+    def _flush(self):
+        self._sock.sendall(self._out)
+        self._out.clear()
+
+    def close(self):
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = b''
+        self._out += b'.\r\n'
+        self._flush()
+
+
+class SMTPSession:
+    """
+    Lazily opened, authenticated SMTP connection that can be reused for several sends.
+    STARTTLS + login happen once; a connection that sat idle is NOOP-checked before reuse,
+    and a send that finds the connection dropped reconnects and retries once.
+    """
+
+    # Back-to-back sends skip the NOOP round-trip. That is only safe because send_message
+    # recovers from a server hang-up (SMTPServerDisconnected / 421) itself; anything idle
+    # longer than this gets checked first
+    IDLE_CHECK_SECONDS = 5
+
+    def __init__(self, smtp_server, port, username, password):
+        self.smtp_server = smtp_server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.messages_sent = 0
+        self._server = None
+        self._last_used = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.smtp_server, self.port)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.messages_sent = 0
+
+    def _is_alive(self):
+        """NOOP round-trip to make sure the server did not drop an idle connection"""
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def connection(self):
+        """Return a live smtplib.SMTP, reconnecting if the cached one went stale"""
+        if (self._server is not None
+                and time.monotonic() - self._last_used > self.IDLE_CHECK_SECONDS
+                and not self._is_alive()):
+            logger.info("SMTP connection went stale, reconnecting")
+            self._discard()
+        if self._server is None:
+            self._connect()
+        return self._server
+
+    def keepalive(self):
+        """NOOP an open connection so the server's idle timeout does not drop it"""
+        if self._server is None:
+            return
+        if self._is_alive():
+            self._last_used = time.monotonic()
+        else:
+            self._discard()
+
+    def send_message(self, message, stream=False):
+        """
+        Send an email.message.Message. With stream=True the message is generated straight
+        onto the socket during DATA instead of being flattened into one bytes object first,
+        which keeps memory flat for large bodies or attachments.
+        """
+        try:
+            result = self._transmit(self.connection(), message, stream)
+        except Exception as e:
+            # Whatever state the connection is in now, it should not be handed out again
+            self._discard()
+            if not self._is_disconnect(e):
+                raise
+            logger.info("SMTP server closed the connection (%s), reconnecting", e)
+            try:
+                result = self._transmit(self.connection(), message, stream)
+            except Exception:
+                self._discard()
+                raise
+        self.messages_sent += 1
+        self._last_used = time.monotonic()
+        return result
+
+    def _transmit(self, server, message, stream):
+        if stream:
+            return self._stream_message(server, message)
+        return server.send_message(message)
+
+    @staticmethod
+    def _is_disconnect(error):
+        """The server hung up, or said it is about to (421 service closing channel)"""
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code == 421
+        # smtplib closes the socket itself on a 421 to RCPT TO and reports it per recipient
+        return (isinstance(error, smtplib.SMTPRecipientsRefused)
+                and any(code == 421 for code, _ in error.recipients.values()))
+
+    @staticmethod
+    def _stream_message(server, message):
+        # Same envelope rules as smtplib.SMTP.send_message (no SMTPUTF8/8BITMIME handling)
+        from_addr = message['Sender'] or message['From']
+        to_addrs = [addr for _, addr in getaddresses(
+            message.get_all('To', []) + message.get_all('Cc', []) + message.get_all('Bcc', []))]
+        message = copy.copy(message)
+        del message['Bcc']
+        del message['Resent-Bcc']
+
+        server.ehlo_or_helo_if_needed()
+        code, resp = server.mail(from_addr)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        refused = {}
+        for addr in to_addrs:
+            code, resp = server.rcpt(addr)
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        if len(refused) == len(to_addrs):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        server.putcmd('data')
+        code, resp = server.getreply()
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        writer = _DataWriter(server.sock)
+        BytesGenerator(writer, mangle_from_=False).flatten(message, linesep='\r\n')
+        writer.close()
+        code, resp = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+    def _discard(self):
+        if self._server is None:
+            return
+        try:
+            self._server.close()
+        except OSError:
+            pass
+        self._server = None
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        finally:
+            self._server = None
+
+
+def is_transient_error(error):
+    """
+    Whether a failed send is worth retrying later: the server hung up, could not be reached, or
+    answered 4xx. 5xx replies (including auth failures and refused recipients) will not change.
+    """
+    if SMTPSession._is_disconnect(error):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    # Socket-level failure (connection refused, timeout, DNS) before any SMTP reply
+    return isinstance(error, OSError)
+
+
+class SMTPPool:
+    """
+    Bounded pool of SMTPSessions shared across requests, so TLS + AUTH is paid once per
+    connection rather than once per email. Connections are recycled after
+    max_messages_per_conn sends to stay under per-connection provider limits. With
+    keepalive_interval set, a daemon thread NOOPs idle connections so they outlive the
+    server's idle timeout between bursts of mail.
+    """
+
+    def __init__(self, smtp_server, port, username, password, maxsize=5, max_messages_per_conn=100,
+                 keepalive_interval=None):
+        self.smtp_server = smtp_server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_messages_per_conn = max_messages_per_conn
+        self.keepalive_interval = keepalive_interval
+        # LIFO hands out the most recently used (warmest) connection first
+        self._idle = queue.LifoQueue(maxsize)
+        self._slots = threading.BoundedSemaphore(maxsize)
+        self._keepalive = None
+        self._keepalive_lock = threading.Lock()
+
+    def _ensure_keepalive(self):
+        # Started lazily so each Gunicorn worker process gets its own thread after fork
+        if not self.keepalive_interval or (self._keepalive is not None and self._keepalive.is_alive()):
+            return
+        with self._keepalive_lock:
+            if self._keepalive is None or not self._keepalive.is_alive():
+                self._keepalive = threading.Thread(target=self._keepalive_loop, name='smtp-keepalive',
+                                                   daemon=True)
+                self._keepalive.start()
+
+    def _keepalive_loop(self):
+        while True:
+            time.sleep(self.keepalive_interval)
+            sessions = []
+            while True:
+                try:
+                    sessions.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+            for session in sessions:
+                session.keepalive()
+            # Put back bottom-first so the warmest connection stays on top
+            for session in reversed(sessions):
+                self._release(session)
+
+    def _release(self, session):
+        try:
+            self._idle.put_nowait(session)
+        except queue.Full:
+            # A sender opened a fresh session while the keepalive thread held this one
+            session.close()
+
+    @contextmanager
+    def acquire(self):
+        """Check out a session; it connects lazily on first send and goes back to the pool afterwards."""
+        self._ensure_keepalive()
+        self._slots.acquire()
+        try:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = SMTPSession(self.smtp_server, self.port, self.username, self.password)
+            try:
+                yield session
+            except Exception:
+                # The connection may be mid-transaction or broken; start clean next time
+                session.close()
+                raise
+            finally:
+                if session.messages_sent >= self.max_messages_per_conn:
+                    session.close()
+                self._release(session)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quit every idle connection (e.g. on shutdown)."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -1,57 +1,118 @@
 # notifications/twilio_service.py
 import os
+import re
+import json
 import logging
 import random
-from typing import Optional, Dict, Any
+import functools
+from typing import Optional, Dict, Any, List
+
+from .events import BOOKING_EVENT_TYPES, to_event_type
 
 logger = logging.getLogger(__name__)
 
+# Deletes every ASCII character except digits and '+', in one C-level pass
+_PHONE_DELETE_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == '+')))
+
+
+# Values copied unchanged from the .env template
+_PLACEHOLDER_RE = re.compile(r'your_(?:account_sid|auth_token|twilio_phone|admin_phone)|example')
+
+
+def _has_placeholder(*values) -> bool:
+    return any(_PLACEHOLDER_RE.search(value) for value in values if value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_phone_number(phone_number: str) -> str:
+    """Ensure phone number has proper E.164 format"""
+    if not phone_number:
+        return phone_number
+
+    # Remove any non-digit characters except +
+    cleaned = phone_number.translate(_PHONE_DELETE_TABLE)
+    if not cleaned.isascii():
+        # The table only covers ASCII; rare non-ASCII input takes the per-character path
+        cleaned = ''.join(c for c in cleaned if c.isdigit() or c == '+')
+
+    # If no country code, assume US/Canada (+1)
+    if not cleaned.startswith('+'):
+        if len(cleaned) == 10:  # US/Canada number without country code
+            cleaned = '+1' + cleaned
+        elif len(cleaned) == 11 and cleaned.startswith('1'):
+            cleaned = '+' + cleaned
+        else:
+            logger.warning("Phone number may not be in E.164 format: %s", phone_number)
+
+    return cleaned
+
+
+# SMS variations indexed by EventType, as f-string lambdas: no format-string parsing per message
+_SMS_VARIATIONS = (
+    (
+        lambda name, service, date, time: f"Hi {name}! Thanks for booking {service} with Capitol City Contracting. We'll contact you within 24 hours to confirm your {date} appointment.",
+        lambda name, service, date, time: f"Hello {name}! Your {service} booking is received. We'll confirm your {date} appointment soon. Thank you!",
+        lambda name, service, date, time: f"Hey {name}! We got your {service} booking for {date}. Our team will reach out within 24 hours to confirm details.",
+        lambda name, service, date, time: f"Thanks {name}! Your {service} project is booked for {date}. We'll contact you shortly to finalize everything."
+    ),
+    (
+        lambda name, service, date, time: f"Great news {name}! Your {service} is confirmed for {date} at {time}. See you then!",
+        lambda name, service, date, time: f"Confirmed! Your {service} is scheduled for {date} at {time}. We're excited to work with you!",
+        lambda name, service, date, time: f"Hello {name}! Your {service} appointment is confirmed for {date} at {time}. Looking forward to it!",
+        lambda name, service, date, time: f"All set {name}! Your {service} is booked for {date} at {time}. We'll see you there!"
+    ),
+    (
+        lambda name, service, date, time: f"Hi {name}. Your {service} booking for {date} has been cancelled as requested.",
+        lambda name, service, date, time: f"Hello {name}. We've cancelled your {service} appointment for {date}. Hope to serve you another time!",
+        lambda name, service, date, time: f"Hi {name}. Your {service} booking on {date} is now cancelled. Let us know if you need to reschedule!",
+        lambda name, service, date, time: f"Cancellation confirmed {name}. Your {service} for {date} has been cancelled."
+    ),
+    (
+        lambda name, service, date, time: f"Hi {name}! Your {service} project is complete! Thanks for choosing Capitol City Contracting.",
+        lambda name, service, date, time: f"Project complete! Your {service} is finished. Thank you for trusting us with your project!",
+        lambda name, service, date, time: f"Hello {name}! We've successfully completed your {service}. Hope you love the results!",
+        lambda name, service, date, time: f"All done {name}! Your {service} project is finished. Thank you for your business!"
+    )
+)
+
+# Admin alert prefixes indexed by EventType, built once
+_ADMIN_PREFIX = tuple(f"ADMIN: {name.replace('_', ' ').title()}" for name in BOOKING_EVENT_TYPES)
+
+# Credential env var -> (TwilioService attribute, how to show its value in the status log)
+_PREVIEWERS = {
+    'TWILIO_ACCOUNT_SID': ('account_sid', lambda value: value[:10] + '...'),
+    'TWILIO_AUTH_TOKEN': ('auth_token', lambda value: '***' + value[-4:] if len(value) > 4 else '***'),
+    'TWILIO_PHONE_NUMBER': ('twilio_phone', lambda value: value),
+    'ADMIN_PHONE': ('admin_phone', lambda value: value),
+}
+
+
 class TwilioService:
     def __init__(self):
         self.account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
         self.auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
         self.twilio_phone = os.environ.get('TWILIO_PHONE_NUMBER')
         self.admin_phone = os.environ.get('ADMIN_PHONE')
+        # Optional: Twilio Notify service used to fan one message out in a single API call
+        self.notify_service_sid = os.environ.get('TWILIO_NOTIFY_SERVICE_SID')
+        # Optional: comma-separated staff numbers that get admin alerts alongside ADMIN_PHONE
+        self.dispatch_phones = [p.strip() for p in os.environ.get('DISPATCH_PHONES', '').split(',') if p.strip()]
+        # Fixed for the life of the process, so format once rather than on every send
+        self._formatted_from = _format_phone_number(self.twilio_phone)
+        self._formatted_admin_phone = _format_phone_number(self.admin_phone)
         self.client = None
         self.is_available = False
+        self._verified = False
         
-        # SMS message variations for natural language
-        self._setup_message_variations()
         self._initialize_client()
     
-    def _setup_message_variations(self):
-        """Setup natural language variations for different SMS events"""
-        self.message_variations = {
-            'booking_created': [
-                "Hi {name}! Thanks for booking {service} with Capitol City Contracting. We'll contact you within 24 hours to confirm your {date} appointment.",
-                "Hello {name}! Your {service} booking is received. We'll confirm your {date} appointment soon. Thank you!",
-                "Hey {name}! We got your {service} booking for {date}. Our team will reach out within 24 hours to confirm details.",
-                "Thanks {name}! Your {service} project is booked for {date}. We'll contact you shortly to finalize everything."
-            ],
-            'booking_confirmed': [
-                "Great news {name}! Your {service} is confirmed for {date} at {time}. See you then!",
-                "Confirmed! Your {service} is scheduled for {date} at {time}. We're excited to work with you!",
-                "Hello {name}! Your {service} appointment is confirmed for {date} at {time}. Looking forward to it!",
-                "All set {name}! Your {service} is booked for {date} at {time}. We'll see you there!"
-            ],
-            'booking_cancelled': [
-                "Hi {name}. Your {service} booking for {date} has been cancelled as requested.",
-                "Hello {name}. We've cancelled your {service} appointment for {date}. Hope to serve you another time!",
-                "Hi {name}. Your {service} booking on {date} is now cancelled. Let us know if you need to reschedule!",
-                "Cancellation confirmed {name}. Your {service} for {date} has been cancelled."
-            ],
-            'booking_completed': [
-                "Hi {name}! Your {service} project is complete! Thanks for choosing Capitol City Contracting.",
-                "Project complete! Your {service} is finished. Thank you for trusting us with your project!",
-                "Hello {name}! We've successfully completed your {service}. Hope you love the results!",
-                "All done {name}! Your {service} project is finished. Thank you for your business!"
-            ]
-        }
-    
     def _initialize_client(self):
         """Initialize Twilio client with proper validation"""
         try:
             from twilio.rest import Client
+            from twilio.http.http_client import TwilioHttpClient
+            from requests.adapters import HTTPAdapter
             self.twilio_module_available = True
         except ImportError:
             logger.warning("Twilio Python library not installed.")
@@ -65,24 +126,25 @@ class TwilioService:
             return
         
         # Check for placeholder values
-        placeholder_indicators = ['your_account_sid', 'your_auth_token', 'your_twilio_phone', 'your_admin_phone', 'example']
-        if any(any(indicator in str(cred) for indicator in placeholder_indicators) 
-               for cred in [self.account_sid, self.auth_token, self.twilio_phone, self.admin_phone]):
+        if _has_placeholder(self.account_sid, self.auth_token, self.twilio_phone, self.admin_phone):
             logger.warning("Twilio credentials contain placeholder values.")
             self._log_credential_status()
             return
         
         try:
             # Test authentication by creating client
-            self.client = Client(self.account_sid, self.auth_token)
-            
-            # Make a test API call to verify credentials
-            test_account = self.client.api.accounts(self.account_sid).fetch()
-            logger.info(f"Twilio authenticated successfully for account: {test_account.friendly_name}")
+            # One keep-alive requests.Session for every API call, with room for concurrent senders,
+            # so bursts of SMS reuse TLS connections instead of handshaking per message
+            http_client = TwilioHttpClient()
+            http_client.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=3))
+            self.client = Client(self.account_sid, self.auth_token, http_client=http_client)
+
+            # No API round-trip here: the first send (or verify_credentials_sync) proves the credentials
+            logger.info("Twilio client initialized")
             self.is_available = True
             
         except Exception as e:
-            logger.error(f"Twilio authentication failed: {str(e)}")
+            logger.error("Twilio authentication failed: %s", e)
             self._handle_auth_error(e)
     
     def _log_missing_credentials(self):
@@ -95,15 +157,17 @@ class TwilioService:
         if not self.twilio_phone:
             missing.append("TWILIO_PHONE_NUMBER")
         
-        logger.warning(f"Missing Twilio credentials: {', '.join(missing)}")
+        logger.warning("Missing Twilio credentials: %s", ', '.join(missing))
     
     def _log_credential_status(self):
         """Log the status of each credential"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         def check_placeholder(value):
             if not value:
                 return "✗ Not set"
-            placeholders = ['your_account_sid', 'your_auth_token', 'your_twilio_phone', 'your_admin_phone', 'example']
-            if any(placeholder in value for placeholder in placeholders):
+            if _PLACEHOLDER_RE.search(value):
                 return "✗ Using placeholder"
             return "✓ Configured"
         
@@ -116,17 +180,9 @@ class TwilioService:
         
         logger.info("Twilio Credential Status:")
         for cred, status in credentials_status.items():
-            value_preview = self.account_sid[:10] + '...' if cred == 'TWILIO_ACCOUNT_SID' and self.account_sid else 'Not set'
-            if cred == 'TWILIO_AUTH_TOKEN' and self.auth_token:
-                value_preview = '***' + self.auth_token[-4:] if len(self.auth_token) > 4 else '***'
-            elif cred == 'TWILIO_PHONE_NUMBER' and self.twilio_phone:
-                value_preview = self.twilio_phone
-            elif cred == 'ADMIN_PHONE' and self.admin_phone:
-                value_preview = self.admin_phone
-            else:
-                value_preview = 'Not set'
-                
-            logger.info(f"  {cred}: {status} | Value: {value_preview}")
+            attr, preview = _PREVIEWERS[cred]
+            value = getattr(self, attr)
+            logger.info("  %s: %s | Value: %s", cred, status, preview(value) if value else 'Not set')
     
     def _handle_auth_error(self, error):
         """Handle specific Twilio authentication errors"""
@@ -141,33 +197,18 @@ class TwilioService:
         elif 'permission' in error_str.lower():
             logger.error("Twilio Permission Error - Check account permissions")
         else:
-            logger.error(f"Twilio Error: {error_str}")
+            logger.error("Twilio Error: %s", error_str)
     
     def _format_phone_number(self, phone_number: str) -> str:
-        """Ensure phone number has proper E.164 format"""
-        if not phone_number:
-            return phone_number
-        
-        # Remove any non-digit characters except +
-        cleaned = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-        
-        # If no country code, assume US/Canada (+1)
-        if not cleaned.startswith('+'):
-            if len(cleaned) == 10:  # US/Canada number without country code
-                cleaned = '+1' + cleaned
-            elif len(cleaned) == 11 and cleaned.startswith('1'):
-                cleaned = '+' + cleaned
-            else:
-                logger.warning(f"Phone number may not be in E.164 format: {phone_number}")
-        
-        return cleaned
+        """Ensure phone number has proper E.164 format (memoized per number)"""
+        return _format_phone_number(phone_number)
     
     def _get_message_variation(self, event_type: str, **kwargs) -> str:
         """Get a random message variation for the event type"""
-        variations = self.message_variations.get(event_type, [])
-        if variations:
-            chosen = random.choice(variations)
-            return chosen.format(**kwargs)
+        event = to_event_type(event_type)
+        if event is not None:
+            variations = _SMS_VARIATIONS[event]
+            return variations[random.randrange(len(variations))](**kwargs)
         return f"Booking {event_type.replace('_', ' ')}: {kwargs.get('service', 'Service')}"
     
     def send_sms(self, message_body: str, to_phone: str) -> Dict[str, Any]:
@@ -197,16 +238,17 @@ class TwilioService:
                     'error': 'Invalid recipient phone number'
                 }
             
-            logger.info(f"Sending SMS to {formatted_phone}: {message_body}")
+            logger.info("Sending SMS to %s: %s", formatted_phone, message_body)
             
             # Send the message
             message = self.client.messages.create(
                 body=message_body,
-                from_=self._format_phone_number(self.twilio_phone),
+                from_=self._formatted_from,
                 to=formatted_phone
             )
             
-            logger.info(f"SMS sent successfully: {message.sid}")
+            logger.info("SMS sent successfully: %s", message.sid)
+            self._verified = True
             
             return {
                 'success': True,
@@ -217,13 +259,65 @@ class TwilioService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to send SMS: {str(e)}")
+            logger.error("Failed to send SMS: %s", e)
+            if not self._verified:
+                # Credentials are only checked lazily, so explain auth failures on the first send
+                self._handle_auth_error(e)
             return {
                 'success': False,
                 'error': str(e),
                 'details': 'Check Twilio credentials and phone number formatting'
             }
     
+    def send_bulk_sms(self, message_body: str, phone_numbers: List[str]) -> Dict[str, Any]:
+        """
+        Send the same SMS to several numbers. With TWILIO_NOTIFY_SERVICE_SID set this is one
+        Notify API call with a binding per number; otherwise it falls back to one send_sms each.
+        """
+        if not self.is_available or not self.client:
+            return {
+                'success': False,
+                'error': 'Twilio service not available',
+                'details': 'Credentials not configured or authentication failed'
+            }
+
+        formatted_phones = [p for p in dict.fromkeys(map(self._format_phone_number, phone_numbers)) if p]
+        if not formatted_phones:
+            return {'success': False, 'error': 'No valid recipient phone numbers'}
+
+        if not self.notify_service_sid:
+            results = [self.send_sms(message_body, phone) for phone in formatted_phones]
+            return {
+                'success': all(result['success'] for result in results),
+                'to': formatted_phones,
+                'results': results
+            }
+
+        try:
+            logger.info("Sending SMS to %s numbers via Notify: %s", len(formatted_phones), message_body)
+            notification = self.client.notify.services(self.notify_service_sid).notifications.create(
+                to_binding=[json.dumps({'binding_type': 'sms', 'address': phone}) for phone in formatted_phones],
+                body=message_body
+            )
+            logger.info("Bulk SMS sent successfully: %s", notification.sid)
+            self._verified = True
+
+            return {
+                'success': True,
+                'notification_sid': notification.sid,
+                'to': formatted_phones
+            }
+
+        except Exception as e:
+            logger.error("Failed to send bulk SMS: %s", e)
+            if not self._verified:
+                self._handle_auth_error(e)
+            return {
+                'success': False,
+                'error': str(e),
+                'details': 'Check TWILIO_NOTIFY_SERVICE_SID and phone number formatting'
+            }
+
     def send_booking_sms(self, booking, service, event_type: str) -> Dict[str, Any]:
         """
         Send booking notification SMS to customer
@@ -234,7 +328,7 @@ class TwilioService:
             event_type: booking_created, booking_confirmed, booking_cancelled, booking_completed
         """
         # Get customer's first name
-        customer_first_name = booking.customer_name.split()[0] if booking.customer_name else booking.customer_name
+        customer_first_name = (booking.customer_name or '').partition(' ')[0] or booking.customer_name
         
         # Generate message with variation
         message_body = self._get_message_variation(
@@ -253,8 +347,43 @@ class TwilioService:
         if not self.admin_phone:
             return {'success': False, 'error': 'Admin phone not configured'}
         
-        message_body = f"ADMIN: {event_type.replace('_', ' ').title()} - {booking.customer_name} - {service.name} on {booking.preferred_date}"
-        return self.send_sms(message_body, self.admin_phone)
+        message_body = self._admin_alert_body(booking, service, event_type)
+        return self.send_sms(message_body, self._formatted_admin_phone)
+
+    @staticmethod
+    def _admin_alert_body(booking, service, event_type: str) -> str:
+        event = to_event_type(event_type)
+        prefix = _ADMIN_PREFIX[event] if event is not None else f"ADMIN: {event_type.replace('_', ' ').title()}"
+        return f"{prefix} - {booking.customer_name} - {service.name} on {booking.preferred_date}"
+    
+    def send_event_fanout(self, booking, service, event_type: str) -> Dict[str, Any]:
+        """
+        Send every SMS for a booking event: the customer's personalised message, plus one
+        bulk send of the admin alert to ADMIN_PHONE and any DISPATCH_PHONES.
+        """
+        results = {'customer': self.send_booking_sms(booking, service, event_type)}
+
+        staff_phones = ([self.admin_phone] if self.admin_phone else []) + self.dispatch_phones
+        if staff_phones:
+            message_body = self._admin_alert_body(booking, service, event_type)
+            results['staff'] = self.send_bulk_sms(message_body, staff_phones)
+
+        return results
+
+    def verify_credentials_sync(self) -> bool:
+        """Verify the credentials with a live API call (opt-in, e.g. for health checks)"""
+        if not self.is_available or not self.client:
+            return False
+
+        try:
+            account = self.client.api.accounts(self.account_sid).fetch()
+            logger.info("Twilio authenticated successfully for account: %s", account.friendly_name)
+            self._verified = True
+            return True
+        except Exception as e:
+            logger.error("Twilio authentication failed: %s", e)
+            self._handle_auth_error(e)
+            return False
     
     def get_account_info(self) -> Dict[str, Any]:
         """Get Twilio account information for debugging"""
@@ -277,9 +406,10 @@ class TwilioService:
         status = {
             'twilio_module_installed': self.twilio_module_available,
             'credentials_configured': all([self.account_sid, self.auth_token, self.twilio_phone]),
-            'using_placeholders': any(any(indicator in str(cred) for indicator in ['your_account_sid', 'your_auth_token', 'your_twilio_phone', 'your_admin_phone', 'example']) 
-                                    for cred in [self.account_sid, self.auth_token, self.twilio_phone, self.admin_phone]),
+            'using_placeholders': _has_placeholder(self.account_sid, self.auth_token, self.twilio_phone,
+                                                   self.admin_phone),
             'authentication_successful': self.is_available,
+            'credentials_verified': self._verified,
             'account_sid_preview': self.account_sid[:10] + '...' if self.account_sid and len(self.account_sid) > 10 else self.account_sid,
             'auth_token_set': bool(self.auth_token),
             'twilio_phone': self.twilio_phone,
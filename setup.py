@@ -3,11 +3,11 @@ import subprocess
 import sys
 import os
 
-def run_command(command):
-    """Run a shell command and return success status"""
+def run_command(args):
+    """Run a command (argument list, no shell) and return success status"""
+    command = " ".join(args)
     try:
-        result = subprocess.run(command, shell=True, check=True, 
-                              capture_output=True, text=True)
+        subprocess.run(args, check=True, capture_output=True, text=True)
         print(f"✓ {command}")
         return True
     except subprocess.CalledProcessError as e:
@@ -18,20 +18,11 @@ def run_command(command):
 def main():
     print("Setting up Capitol City Contracting website...")
     
-    # Install Flask and dependencies
-    packages = [
-        "Flask==2.3.3",
-        "Flask-SQLAlchemy==3.0.5", 
-        "twilio==8.10.0",
-        "python-dotenv==1.0.0",
-        "gunicorn==21.2.0"
-    ]
-    
+    # Install Flask and dependencies in one pip run (one resolver pass over the pinned set)
     print("Installing dependencies...")
-    for package in packages:
-        if not run_command(f"pip install {package}"):
-            print(f"Failed to install {package}")
-            sys.exit(1)
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]):
+        print("Failed to install requirements.txt")
+        sys.exit(1)
     
     # Create .env file if it doesn't exist
     if not os.path.exists(".env"):
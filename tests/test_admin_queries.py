@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture(scope='module')
+def smartmove(tmp_path_factory):
+    # app.py reads DATABASE_URL at import time, so point it at a scratch SQLite file first
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp_path_factory.mktemp('db') / 'smartmove.db'}"
+    os.environ.pop('REDIS_URL', None)
+    import app as smartmove
+    with smartmove.app.app_context():
+        smartmove.seed_database()
+    return smartmove
+
+
+def add_bookings(smartmove, count):
+    with smartmove.app.app_context():
+        service_id = smartmove.db.session.scalar(smartmove.db.select(smartmove.Service.id).limit(1))
+        smartmove.db.session.execute(smartmove.db.insert(smartmove.Booking), [
+            dict(customer_name=f'Customer {n}', customer_email=f'customer{n}@example.com',
+                 customer_phone='+14165550100', service_id=service_id, project_description='Two bedrooms',
+                 preferred_date='2025-01-01', preferred_time='09:00', address='1 Main St',
+                 status=('pending', 'confirmed', 'completed')[n % 3])
+            for n in range(count)
+        ])
+        smartmove.db.session.commit()
+
+
+def admin_page_statements(smartmove):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with smartmove.app.app_context():
+        engine = smartmove.db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = smartmove.app.test_client().get('/admin/bookings')
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    return statements
+
+
+def test_admin_bookings_query_count_is_constant(smartmove):
+    add_bookings(smartmove, 5)
+    few = admin_page_statements(smartmove)
+
+    # A full page and then some: per-row lazy loads would show up as extra statements
+    add_bookings(smartmove, 2 * smartmove.ADMIN_BOOKINGS_PER_PAGE)
+    many = admin_page_statements(smartmove)
+
+    # Total count for the pager, the page itself (service joined in), and the status GROUP BY
+    assert len(few) == len(many) == 3
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+from notifications.email_service import EmailService
+from notifications.events import EventType
+
+
+class RecordingSession:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message, stream=False):
+        self.messages.append(message)
+        return {}
+
+
+@pytest.fixture
+def email_service(monkeypatch):
+    monkeypatch.setenv('MAIL_USERNAME', 'sender@example.com')
+    monkeypatch.setenv('MAIL_PASSWORD', 'secret')
+    monkeypatch.setenv('ADMIN_EMAIL', 'admin@example.com')
+    monkeypatch.delenv('MAIL_BCC', raising=False)
+    return EmailService()
+
+
+def dispatched_to(email_service, event_type):
+    booking = SimpleNamespace(id=1, customer_name='Ada Lovelace', customer_email='ada@example.com',
+                              customer_phone='555-0100', preferred_date='2025-01-01', preferred_time='09:00',
+                              address='1 Main St', project_description='Two bedrooms', status='pending')
+    session = RecordingSession()
+    email_service.dispatch(booking, SimpleNamespace(name='Residential Moving'), event_type, session)
+    return [message['To'] for message in session.messages]
+
+
+@pytest.mark.parametrize('event_type, recipients', [
+    ('booking_created', ['ada@example.com', 'admin@example.com']),
+    (EventType.CREATED, ['ada@example.com', 'admin@example.com']),
+    ('booking_cancelled', ['ada@example.com', 'admin@example.com']),
+    (EventType.CANCELLED, ['ada@example.com', 'admin@example.com']),
+    ('booking_confirmed', ['ada@example.com']),
+    (EventType.COMPLETED, ['ada@example.com']),
+])
+def test_dispatch_accepts_names_and_event_types(email_service, event_type, recipients):
+    assert dispatched_to(email_service, event_type) == recipients
+
+
+def test_dispatch_rejects_unknown_events(email_service):
+    with pytest.raises(ValueError):
+        dispatched_to(email_service, 'booking_teleported')
@@ -0,0 +1,127 @@
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from notifications.smtp_client import SMTPSession, is_transient_error
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP; the server hangs up after drop_after messages on a connection."""
+
+    drop_after = 2
+    drop_with = 'disconnect'
+
+    def __init__(self, host, port):
+        self.sent = []
+        self.connected = True
+        FakeSMTP.connections.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def noop(self):
+        return (250, b'OK') if self.connected else (421, b'closed')
+
+    def send_message(self, message):
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected('please run connect() first')
+        if len(self.sent) >= self.drop_after:
+            self.connected = False
+            if self.drop_with == '421':
+                raise smtplib.SMTPSenderRefused(421, b'Service closing transmission channel', message['From'])
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.append(message)
+        return {}
+
+    def quit(self):
+        self.connected = False
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.connections = []
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    return FakeSMTP
+
+
+def make_message(n):
+    message = EmailMessage()
+    message['From'] = 'sender@example.com'
+    message['To'] = 'customer@example.com'
+    message['Subject'] = f'Message {n}'
+    message.set_content('Hello')
+    return message
+
+
+@pytest.mark.parametrize('drop_with', ['disconnect', '421'])
+def test_send_after_server_disconnect_reconnects(fake_smtp, monkeypatch, drop_with):
+    monkeypatch.setattr(fake_smtp, 'drop_with', drop_with)
+    session = SMTPSession('smtp.example.com', 587, 'user', 'secret')
+
+    for n in range(5):
+        session.send_message(make_message(n))
+
+    first, second, third = fake_smtp.connections
+    assert [m['Subject'] for m in first.sent] == ['Message 0', 'Message 1']
+    assert [m['Subject'] for m in second.sent] == ['Message 2', 'Message 3']
+    assert [m['Subject'] for m in third.sent] == ['Message 4']
+
+
+def test_other_send_errors_discard_the_connection(fake_smtp, monkeypatch):
+    session = SMTPSession('smtp.example.com', 587, 'user', 'secret')
+    session.send_message(make_message(0))
+
+    def refuse(message):
+        raise smtplib.SMTPDataError(554, b'Rejected')
+
+    monkeypatch.setattr(fake_smtp.connections[0], 'send_message', refuse)
+    with pytest.raises(smtplib.SMTPDataError):
+        session.send_message(make_message(1))
+
+    # The next send gets a fresh connection instead of the one the error left behind
+    session.send_message(make_message(2))
+    assert len(fake_smtp.connections) == 2
+    assert [m['Subject'] for m in fake_smtp.connections[1].sent] == ['Message 2']
+
+
+def test_dispatch_after_server_disconnect(fake_smtp, monkeypatch):
+    from types import SimpleNamespace
+    from notifications.email_service import EmailService
+
+    monkeypatch.setenv('MAIL_USERNAME', 'sender@example.com')
+    monkeypatch.setenv('MAIL_PASSWORD', 'secret')
+    monkeypatch.delenv('ADMIN_EMAIL', raising=False)
+    monkeypatch.delenv('MAIL_BCC', raising=False)
+    email_service = EmailService()
+    booking = SimpleNamespace(id=1, customer_name='Ada Lovelace', customer_email='ada@example.com',
+                              customer_phone='555-0100', preferred_date='2025-01-01', preferred_time='09:00',
+                              address='1 Main St', project_description='Two bedrooms', status='confirmed')
+    service = SimpleNamespace(name='Residential Moving', description='', price_range='')
+
+    session = SMTPSession('smtp.example.com', 587, 'user', 'secret')
+    sent = [email_service.dispatch(booking, service, 'booking_confirmed', session) for _ in range(3)]
+
+    assert sent == [1, 1, 1]
+    assert len(fake_smtp.connections) == 2
+
+
+@pytest.mark.parametrize('error, transient', [
+    (smtplib.SMTPServerDisconnected('Connection unexpectedly closed'), True),
+    (smtplib.SMTPSenderRefused(421, b'Service closing transmission channel', 'sender@example.com'), True),
+    (smtplib.SMTPDataError(451, b'Try again later'), True),
+    (smtplib.SMTPRecipientsRefused({'customer@example.com': (450, b'Mailbox busy')}), True),
+    (ConnectionRefusedError(111, 'Connection refused'), True),
+    (smtplib.SMTPAuthenticationError(535, b'Bad credentials'), False),
+    (smtplib.SMTPSenderRefused(553, b'Sender not allowed', 'sender@example.com'), False),
+    (smtplib.SMTPDataError(554, b'Rejected'), False),
+    (smtplib.SMTPRecipientsRefused({'customer@example.com': (550, b'No such user')}), False),
+])
+def test_is_transient_error(error, transient):
+    assert is_transient_error(error) is transient
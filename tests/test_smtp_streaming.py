@@ -0,0 +1,102 @@
+import smtplib
+from email.message import EmailMessage, Message
+
+import pytest
+
+from notifications.smtp_client import SMTPSession, _DataWriter
+
+
+class CaptureSocket:
+    def __init__(self):
+        self.data = bytearray()
+
+    def sendall(self, data):
+        self.data += data
+
+
+class CapturingSMTP(smtplib.SMTP):
+    """smtplib.SMTP with no network: records every byte sent and accepts every command."""
+
+    def __init__(self):
+        super().__init__()
+        self.sock = CaptureSocket()
+        self.ehlo_resp = b'fake.example.com'
+        self._last_command = None
+
+    def putcmd(self, cmd, args=''):
+        self._last_command = cmd.lower()
+        super().putcmd(cmd, args)
+
+    def getreply(self):
+        if self._last_command == 'data':
+            self._last_command = None
+            return 354, b'End data with <CR><LF>.<CR><LF>'
+        return 250, b'OK'
+
+
+def wire_bytes(message, stream):
+    server = CapturingSMTP()
+    if stream:
+        SMTPSession._stream_message(server, message)
+    else:
+        server.send_message(message)
+    return bytes(server.sock.data)
+
+
+def addressed(message):
+    message['From'] = 'sender@example.com'
+    message['To'] = 'customer@example.com'
+    message['Bcc'] = 'dispatch@example.com'
+    message['Subject'] = 'Your move'
+    return message
+
+
+def dotted_message():
+    message = addressed(EmailMessage())
+    message.set_content('.leading dot\n..two dots\n.\nmiddle . dot\nlast line\n')
+    return message
+
+
+def unterminated_message():
+    # Legacy Message: the payload goes out exactly as set, without a final newline
+    message = addressed(Message())
+    message.set_payload('first line\n.second line\nno newline at the end')
+    return message
+
+
+def large_html_message():
+    message = addressed(EmailMessage())
+    lines = [f'.row {n} <td>{"x" * (n % 120)}</td>' if n % 3 == 0 else f'row {n}' for n in range(2000)]
+    message.set_content('\n'.join(lines), subtype='html')
+    return message
+
+
+@pytest.mark.parametrize('build', [dotted_message, unterminated_message, large_html_message])
+def test_streamed_data_matches_smtplib(build):
+    assert wire_bytes(build(), stream=True) == wire_bytes(build(), stream=False)
+
+
+def test_bcc_is_a_recipient_but_not_a_header():
+    sent = wire_bytes(dotted_message(), stream=True)
+    assert b'rcpt TO:<dispatch@example.com>' in sent
+    assert b'Bcc:' not in sent
+
+
+def test_data_writer_joins_crlf_split_across_writes():
+    sock = CaptureSocket()
+    writer = _DataWriter(sock)
+    writer.write(b'first line\r')
+    writer.write(b'\n.second line\r\n')
+    writer.write(b'.')
+    writer.write(b'third line\r\nno newline')
+    writer.close()
+    assert bytes(sock.data) == b'first line\r\n..second line\r\n..third line\r\nno newline\r\n.\r\n'
+
+
+def test_data_writer_flushes_in_chunks():
+    sock = CaptureSocket()
+    writer = _DataWriter(sock, bufsize=16)
+    writer.write(b'0123456789\n' * 3)
+    assert sock.data == b'0123456789\r\n' * 3
+    writer.close()
+    assert sock.data == b'0123456789\r\n' * 3 + b'.\r\n'